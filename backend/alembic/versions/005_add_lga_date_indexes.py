@@ -0,0 +1,51 @@
+"""Add composite (lga_id, date) and BRIN date indexes
+
+Revision ID: 005
+Revises: 004_drop_geometry_json
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_lga_date_indexes'
+down_revision: Union[str, None] = '004_drop_geometry_json'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    # Composite indexes serve per-LGA date range scans (historical endpoint)
+    # and per-LGA MAX(date) lookups (latest endpoint) without a sort step
+    op.create_index(
+        'ix_env_lga_date',
+        'environmental_data',
+        ['lga_id', sa.text('observation_date DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_case_lga_date',
+        'case_reports',
+        ['lga_id', sa.text('report_date DESC')],
+        unique=False
+    )
+
+    # BRIN indexes are tiny and well suited to append-mostly date columns
+    if is_postgres:
+        op.execute('CREATE INDEX IF NOT EXISTS ix_env_date_brin ON environmental_data USING BRIN (observation_date)')
+        op.execute('CREATE INDEX IF NOT EXISTS ix_case_date_brin ON case_reports USING BRIN (report_date)')
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_case_date_brin')
+    op.execute('DROP INDEX IF EXISTS ix_env_date_brin')
+
+    op.drop_index('ix_case_lga_date', table_name='case_reports')
+    op.drop_index('ix_env_lga_date', table_name='environmental_data')
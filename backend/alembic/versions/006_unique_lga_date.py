@@ -0,0 +1,89 @@
+"""Enforce one environmental/case row per (lga_id, date)
+
+Revision ID: 006
+Revises: 005_add_lga_date_indexes
+Create Date: 2026-10-16
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_unique_lga_date'
+down_revision: Union[str, None] = '005_add_lga_date_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Case count columns summed when duplicate case reports are merged
+CASE_COUNT_COLUMNS = [
+    "new_cases", "suspected_cases", "confirmed_cases", "deaths", "recoveries",
+    "cases_under_5", "cases_5_to_14", "cases_15_plus", "cases_male", "cases_female"
+]
+
+
+def _merge_duplicate_case_reports() -> None:
+    """Collapse case reports sharing (lga_id, report_date) into one LGA total.
+
+    Case reports are LGA-level daily totals. Duplicates (e.g. one row per ward
+    or repeated uploads) are summed into the most recently inserted row so no
+    cases or deaths are lost; ward_id is kept only if every merged row had the
+    same ward, and cfr is recomputed from the summed counts.
+    """
+    bind = op.get_bind()
+    groups, rows = bind.execute(sa.text(
+        "SELECT COUNT(*), COALESCE(SUM(n), 0) FROM ("
+        "SELECT COUNT(*) AS n FROM case_reports "
+        "GROUP BY lga_id, report_date HAVING COUNT(*) > 1) AS dup"
+    )).one()
+    if not groups:
+        return
+
+    logger.warning(
+        "Merging %d case_reports rows into %d (lga_id, report_date) totals", rows, groups
+    )
+    sums = ", ".join(f"SUM(COALESCE({col}, 0)) AS {col}" for col in CASE_COUNT_COLUMNS)
+    assignments = ", ".join(f"{col} = merged.{col}" for col in CASE_COUNT_COLUMNS)
+    bind.execute(sa.text(
+        f"UPDATE case_reports AS kept SET {assignments}, "
+        "ward_id = merged.ward_id, "
+        "cfr = CASE WHEN merged.new_cases > 0 "
+        "THEN merged.deaths * 100.0 / merged.new_cases END "
+        f"FROM (SELECT MAX(id) AS id, {sums}, "
+        "CASE WHEN COUNT(ward_id) = COUNT(*) AND COUNT(DISTINCT ward_id) = 1 "
+        "THEN MAX(ward_id) END AS ward_id "
+        "FROM case_reports GROUP BY lga_id, report_date HAVING COUNT(*) > 1) AS merged "
+        "WHERE kept.id = merged.id"
+    ))
+    bind.execute(sa.text(
+        "DELETE FROM case_reports WHERE id NOT IN ("
+        "SELECT MAX(id) FROM case_reports GROUP BY lga_id, report_date)"
+    ))
+
+
+def upgrade() -> None:
+    # Drop duplicates first, keeping the most recently inserted row per key
+    op.execute(sa.text(
+        "DELETE FROM environmental_data WHERE id NOT IN ("
+        "SELECT MAX(id) FROM environmental_data GROUP BY lga_id, observation_date)"
+    ))
+    # Case counts are summed rather than dropped
+    _merge_duplicate_case_reports()
+
+    op.create_unique_constraint(
+        'uq_env_lga_date', 'environmental_data', ['lga_id', 'observation_date']
+    )
+    op.create_unique_constraint(
+        'uq_case_lga_date', 'case_reports', ['lga_id', 'report_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_case_lga_date', 'case_reports', type_='unique')
+    op.drop_constraint('uq_env_lga_date', 'environmental_data', type_='unique')
@@ -0,0 +1,34 @@
+"""Enforce one risk score per (lga_id, score_date)
+
+Revision ID: 007
+Revises: 006_unique_lga_date
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_unique_risk_score'
+down_revision: Union[str, None] = '006_unique_lga_date'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicates first, keeping the most recently inserted row per key
+    op.execute(sa.text(
+        "DELETE FROM risk_scores WHERE id NOT IN ("
+        "SELECT MAX(id) FROM risk_scores GROUP BY lga_id, score_date)"
+    ))
+
+    op.create_unique_constraint(
+        'uq_risk_lga_date', 'risk_scores', ['lga_id', 'score_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_risk_lga_date', 'risk_scores', type_='unique')
@@ -0,0 +1,26 @@
+"""Add input_hash to risk_scores
+
+Revision ID: 008
+Revises: 007_unique_risk_score
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_risk_score_input_hash'
+down_revision: Union[str, None] = '007_unique_risk_score'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('risk_scores', sa.Column('input_hash', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('risk_scores', 'input_hash')
@@ -0,0 +1,100 @@
+"""PostgreSQL COPY-based bulk loading helpers."""
+import csv
+import enum
+import io
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Unquoted field COPY reads as NULL
+COPY_NULL = r"\N"
+
+
+def _python_defaults(table: Table, provided: Iterable[str]) -> Dict[str, Any]:
+    """Evaluate scalar/callable column defaults for columns not provided."""
+    provided = set(provided)
+    defaults = {}
+    for column in table.columns:
+        if column.key in provided or column.primary_key or column.default is None:
+            continue
+        default = column.default
+        if default.is_scalar:
+            value = default.arg
+        elif default.is_callable:
+            value = default.arg(None)
+        else:
+            continue
+        # Enum defaults must be written as their stored value, not "Enum.MEMBER"
+        defaults[column.key] = value.value if isinstance(value, enum.Enum) else value
+    return defaults
+
+
+def copy_rows(
+    db: Session,
+    table: Table,
+    rows: List[Dict],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None
+) -> None:
+    """Bulk load rows with COPY FROM STDIN and merge them into a table.
+
+    COPY cannot resolve conflicts itself, so rows are streamed into a
+    temporary staging table first and then merged with a single
+    INSERT ... SELECT ... ON CONFLICT. Runs inside the session's current
+    transaction; nothing is committed here.
+
+    COPY bypasses SQLAlchemy, so Python-side column defaults (e.g.
+    created_at) are evaluated once here for any column the rows omit.
+
+    Args:
+        db: Database session.
+        table: Target table.
+        rows: Row mappings; all rows must share the keys of the first.
+        conflict_columns: Columns of the unique constraint to merge on.
+        update_columns: Columns to overwrite on conflict. When omitted,
+            conflicting rows are skipped (DO NOTHING).
+    """
+    if not rows:
+        return
+
+    defaults = _python_defaults(table, rows[0].keys())
+    columns = list(rows[0].keys()) + list(defaults.keys())
+    column_list = ", ".join(columns)
+    stage = f"_stage_{table.name}"
+
+    # None is written as an explicit NULL marker so empty strings stay empty
+    # strings (COPY CSV would otherwise read both as NULL)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            COPY_NULL if value is None else value
+            for value in (row.get(column, defaults.get(column)) for column in columns)
+        ])
+    buffer.seek(0)
+
+    if update_columns:
+        assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+        on_conflict = f"DO UPDATE SET {assignments}"
+    else:
+        on_conflict = "DO NOTHING"
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            f"CREATE TEMP TABLE {stage} AS SELECT {column_list} FROM {table.name} WITH NO DATA"
+        )
+        cursor.copy_expert(f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer)
+        cursor.execute(
+            f"INSERT INTO {table.name} ({column_list}) SELECT {column_list} FROM {stage} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {on_conflict}"
+        )
+        cursor.execute(f"DROP TABLE {stage}")
+    finally:
+        cursor.close()
+
+    logger.info("Bulk loaded %d rows into %s via COPY", len(rows), table.name)
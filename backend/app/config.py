@@ -13,11 +13,16 @@ class Settings(BaseSettings):
     database_pool_size: int = 5
     database_max_overflow: int = 10
     database_ssl_mode: str = "require"
+    database_batch_page_size: int = 10000  # rows per multi-row INSERT / executemany batch
 
     # Google Earth Engine
     gee_service_account_email: Optional[str] = None
     gee_private_key_path: Optional[str] = None
     gee_service_account_json: Optional[str] = None
+    gee_high_volume: bool = False  # use the high-volume endpoint for batch workloads
+    gee_batch_workers: int = 10  # LGAs fetched concurrently by fetch_data_for_lgas
+    gee_result_cache_ttl: int = 86400  # seconds a per-LGA fetch result is reused
+    gee_export_asset_root: Optional[str] = None  # EE asset folder for nightly per-LGA stats exports
 
     # NASA Earthdata
     nasa_earthdata_username: Optional[str] = None
@@ -28,7 +28,12 @@ engine = create_engine(
     echo=settings.debug,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
-    connect_args={"sslmode": settings.database_ssl_mode}
+    connect_args={"sslmode": settings.database_ssl_mode},
+    # Batch executemany() calls into multi-row statements instead of one
+    # round-trip per row
+    executemany_mode="values_plus_batch",
+    executemany_batch_page_size=settings.database_batch_page_size,
+    insertmanyvalues_page_size=settings.database_batch_page_size
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
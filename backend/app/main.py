@@ -72,6 +72,35 @@ def scheduled_risk_calculation():
         db.close()
 
 
+def scheduled_gee_export():
+    """Scheduled task to export the past week's per-LGA GEE stats to an EE asset."""
+    from datetime import date, timedelta
+    from app.models import LGA
+    from app.services.earth_engine import EarthEngineService
+
+    logger.info("Starting scheduled GEE stats export...")
+    db = SessionLocal()
+    try:
+        lga_ids = [lga_id for (lga_id,) in db.query(LGA.id).all()]
+    finally:
+        db.close()
+
+    end_date = date.today()
+    EarthEngineService().export_daily_stats(lga_ids, end_date - timedelta(days=7), end_date)
+
+
+def scheduled_gee_ingest():
+    """Scheduled task to load tonight's finished GEE stats export into environmental_data."""
+    from datetime import date
+    from app.services.earth_engine import EarthEngineService
+
+    logger.info("Starting scheduled GEE stats ingest...")
+    try:
+        EarthEngineService().ingest_daily_stats(date.today())
+    except Exception as e:
+        logger.error(f"Error in scheduled GEE stats ingest: {e}")
+
+
 def auto_seed_if_empty():
     """Seed database with demo data if no LGAs exist."""
     from app.models import LGA
@@ -116,6 +145,24 @@ async def lifespan(app: FastAPI):
         minute=0,
         id='daily_risk_calculation'
     )
+    # Export per-LGA satellite stats nightly as an EE batch task and ingest
+    # the result into environmental_data (if configured)
+    if settings.gee_export_asset_root:
+        scheduler.add_job(
+            scheduled_gee_export,
+            'cron',
+            hour=2,
+            minute=0,
+            id='nightly_gee_export'
+        )
+        # Load the finished export before the daily risk calculation
+        scheduler.add_job(
+            scheduled_gee_ingest,
+            'cron',
+            hour=5,
+            minute=0,
+            id='nightly_gee_ingest'
+        )
     scheduler.start()
     logger.info("Background scheduler started")
 
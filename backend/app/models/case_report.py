@@ -1,6 +1,6 @@
 """Cholera case report model."""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -65,6 +65,15 @@ class CaseReport(Base):
     lga = relationship("LGA", back_populates="case_reports")
     ward = relationship("Ward", back_populates="case_reports")
 
+    # One report per LGA per day: rows are LGA-level totals that imports
+    # upsert in place. ward_id only attributes a total to a single ward;
+    # ward-level breakdowns are not stored as separate rows.
+    __table_args__ = (
+        UniqueConstraint("lga_id", "report_date", name="uq_case_lga_date"),
+        Index("ix_case_lga_date", lga_id, report_date.desc()),
+        Index("ix_case_date_brin", report_date, postgresql_using="brin"),
+    )
+
     def __repr__(self):
         return f"<CaseReport(id={self.id}, lga_id={self.lga_id}, date={self.report_date}, cases={self.new_cases})>"
 
@@ -1,6 +1,7 @@
 """Environmental data and risk score models."""
+from bisect import bisect_right
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -13,6 +14,11 @@ class RiskLevel(str, enum.Enum):
     RED = "red"        # High risk: > 0.6
 
 
+# Lower score bounds of each level after GREEN, and the levels in score order
+LEVEL_THRESHOLDS = (0.3, 0.6)
+LEVELS = (RiskLevel.GREEN, RiskLevel.YELLOW, RiskLevel.RED)
+
+
 class EnvironmentalData(Base):
     """Environmental/satellite data for an LGA on a specific date."""
 
@@ -51,6 +57,12 @@ class EnvironmentalData(Base):
     # Relationships
     lga = relationship("LGA", back_populates="environmental_data")
 
+    __table_args__ = (
+        UniqueConstraint("lga_id", "observation_date", name="uq_env_lga_date"),
+        Index("ix_env_lga_date", lga_id, observation_date.desc()),
+        Index("ix_env_date_brin", observation_date, postgresql_using="brin"),
+    )
+
     def __repr__(self):
         return f"<EnvironmentalData(lga_id={self.lga_id}, date={self.observation_date})>"
 
@@ -86,19 +98,19 @@ class RiskScore(Base):
     calculated_at = Column(DateTime, default=datetime.utcnow)
     algorithm_version = Column(String(20), default="1.0")
     notes = Column(Text, nullable=True)
+    input_hash = Column(String(32), nullable=True)  # Fingerprint of the inputs scored
 
     # Relationships
     lga = relationship("LGA", back_populates="risk_scores")
 
+    __table_args__ = (
+        UniqueConstraint("lga_id", "score_date", name="uq_risk_lga_date"),
+    )
+
     def __repr__(self):
         return f"<RiskScore(lga_id={self.lga_id}, date={self.score_date}, score={self.score}, level={self.level})>"
 
     @classmethod
     def get_level_from_score(cls, score: float) -> str:
         """Determine risk level from score."""
-        if score < 0.3:
-            return RiskLevel.GREEN
-        elif score < 0.6:
-            return RiskLevel.YELLOW
-        else:
-            return RiskLevel.RED
+        return LEVELS[bisect_right(LEVEL_THRESHOLDS, score)]
@@ -68,16 +68,17 @@ def get_facilities_geojson(db: Session = Depends(get_db)):
 async def fetch_osm_data(
     request: Request,
     background_tasks: BackgroundTasks,
+    force_refresh: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Trigger background fetch of health facilities from OpenStreetMap."""
+    """Trigger background fetch of health facilities from OpenStreetMap (force_refresh bypasses the Overpass cache)."""
     def task():
         # Re-instantiate session for background task
         from app.database import SessionLocal
         db_bg = SessionLocal()
         svc = OSMService(db_bg)
         try:
-            svc.fetch_health_facilities()
+            svc.fetch_health_facilities(force_refresh=force_refresh)
             svc.assign_facilities_to_lgas()
         except Exception as e:
             logger.error(f"OSM fetch failed: {e}")
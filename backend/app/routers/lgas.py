@@ -227,16 +227,19 @@ def get_lga(request: Request, lga_id: int, db: Session = Depends(get_db)):
     if not lga:
         raise HTTPException(status_code=404, detail="LGA not found")
 
-    response = LGAWithGeometry.model_validate(lga)
-
     # Convert PostGIS geometry to GeoJSON
+    geometry = None
     if lga.geometry is not None:
         try:
-            response.geometry = mapping(to_shape(lga.geometry))
+            geometry = mapping(to_shape(lga.geometry))
         except Exception:
-            response.geometry = None
+            geometry = None
 
-    return response
+    # Response models are frozen, so build the geometry-bearing model in one go
+    return LGAWithGeometry(
+        **LGAResponse.model_validate(lga).model_dump(),
+        geometry=geometry
+    )
 
 
 @router.get("/{lga_id}/risk-scores", response_model=List[RiskScoreResponse])
@@ -1,8 +1,12 @@
 """Satellite data endpoints."""
+import hashlib
 import logging
 from datetime import date, timedelta
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
+import orjson
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 from geoalchemy2.shape import to_shape
 from geoalchemy2.exc import ArgumentError
@@ -11,7 +15,7 @@ from shapely.errors import ShapelyError
 
 from app.database import get_db
 from app.models import LGA, EnvironmentalData
-from app.services.earth_engine import EarthEngineService
+from app.services.earth_engine import EarthEngineService, GEE_SIMPLIFY_TOLERANCE
 from app.services.nasa_gpm import NASAGPMService
 from app.rate_limiter import limiter
 
@@ -20,12 +24,76 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/satellite", tags=["Satellite"])
 
 
+def _latest_environmental_select():
+    """Build the statement selecting each LGA's most recent environmental record.
+
+    Used as the root of a lambda statement so SQLAlchemy only constructs it
+    on the first execution; later calls reuse the cached statement and only
+    rebind parameters.
+    """
+    subquery = (
+        select(
+            EnvironmentalData.lga_id,
+            func.max(EnvironmentalData.observation_date).label("max_date")
+        )
+        .group_by(EnvironmentalData.lga_id)
+        .subquery()
+    )
+
+    return (
+        select(
+            EnvironmentalData.lga_id,
+            LGA.name.label("lga_name"),
+            EnvironmentalData.observation_date,
+            EnvironmentalData.rainfall_mm,
+            EnvironmentalData.rainfall_7day_mm,
+            EnvironmentalData.ndwi,
+            EnvironmentalData.flood_extent_pct,
+            EnvironmentalData.flood_observed,
+            EnvironmentalData.lst_day,
+            EnvironmentalData.data_source
+        )
+        .join(LGA)
+        .join(
+            subquery,
+            (EnvironmentalData.lga_id == subquery.c.lga_id) &
+            (EnvironmentalData.observation_date == subquery.c.max_date)
+        )
+    )
+
+
+def _records_json(result) -> Tuple[bytes, int]:
+    """Encode a Core result as a JSON array of records.
+
+    orjson writes the same output as the standard JSON encoder for these
+    columns (shortest round-trip floats, dates as YYYY-MM-DD) without
+    building a DataFrame or losing float precision.
+
+    Args:
+        result: SQLAlchemy Result from a column select.
+
+    Returns:
+        Tuple of (UTF-8 encoded JSON array, number of records).
+    """
+    rows = result.mappings().all()
+    return orjson.dumps([dict(row) for row in rows]), len(rows)
+
+
+def _sar_window(target_date: Optional[date]) -> Tuple[date, date]:
+    """Return the (start, end) SAR search window ending on the target date.
+
+    The window spans 30 days (Sentinel-1 revisit is 6-12 days, but coverage varies).
+    """
+    end_date = target_date or date.today()
+    return end_date - timedelta(days=30), end_date
+
+
 @router.get("/tiles/flood/{lga_id}")
 @limiter.limit("30/minute")
 def get_flood_tiles(
     request: Request,
     lga_id: int,
-    date_str: Optional[str] = Query(None, alias="date"),
+    target_date: Optional[date] = Query(None, alias="date"),
     db: Session = Depends(get_db)
 ):
     """
@@ -34,7 +102,7 @@ def get_flood_tiles(
     Args:
         request: The FastAPI request object.
         lga_id: The ID of the LGA to analyze.
-        date_str: Optional target date (ISO format). Defaults to today.
+        target_date: Optional target date (ISO format). Defaults to today.
         db: Database session.
 
     Returns:
@@ -53,23 +121,14 @@ def get_flood_tiles(
         raise HTTPException(status_code=404, detail="LGA or geometry not found")
 
     try:
-        geometry = mapping(to_shape(lga.geometry))
+        geometry = mapping(
+            to_shape(lga.geometry).simplify(GEE_SIMPLIFY_TOLERANCE, preserve_topology=True)
+        )
     except (ShapelyError, ArgumentError, ValueError) as err:
         logger.exception("Invalid LGA geometry", extra={"lga_id": lga_id})
         raise HTTPException(status_code=500, detail="Invalid LGA geometry") from err
 
-    # Determine date range
-    if date_str:
-        try:
-            target_date = date.fromisoformat(date_str)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format")
-    else:
-        target_date = date.today()
-
-    # Window: 30 days (Sentinel-1 revisit is 6-12 days, but coverage varies)
-    start_date = target_date - timedelta(days=30)
-    end_date = target_date
+    start_date, end_date = _sar_window(target_date)
 
     map_data = gee_service.get_sar_flood_mapid(geometry, start_date, end_date)
 
@@ -79,12 +138,63 @@ def get_flood_tiles(
     return map_data
 
 
+@router.get("/tiles/flood-layers/{lga_id}")
+@limiter.limit("30/minute")
+def get_flood_layer_tiles(
+    request: Request,
+    lga_id: int,
+    target_date: Optional[date] = Query(None, alias="date"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get GEE MapIDs for the SAR background and flood water as separate tile layers.
+
+    Args:
+        request: The FastAPI request object.
+        lga_id: The ID of the LGA to analyze.
+        target_date: Optional target date (ISO format). Defaults to today.
+        db: Database session.
+
+    Returns:
+        Dict with 'background' and 'water' layers, each containing 'url'
+        (tile template) and 'token'.
+
+    Raises:
+        HTTPException: If GEE is not configured, LGA not found, or no data available.
+    """
+    gee_service = EarthEngineService()
+
+    if not gee_service.is_configured():
+        raise HTTPException(status_code=503, detail="GEE not configured")
+
+    lga = db.query(LGA).filter(LGA.id == lga_id).first()
+    if not lga or lga.geometry is None:
+        raise HTTPException(status_code=404, detail="LGA or geometry not found")
+
+    try:
+        geometry = mapping(
+            to_shape(lga.geometry).simplify(GEE_SIMPLIFY_TOLERANCE, preserve_topology=True)
+        )
+    except (ShapelyError, ArgumentError, ValueError) as err:
+        logger.exception("Invalid LGA geometry", extra={"lga_id": lga_id})
+        raise HTTPException(status_code=500, detail="Invalid LGA geometry") from err
+
+    start_date, end_date = _sar_window(target_date)
+
+    layers = gee_service.get_sar_flood_layers(geometry, start_date, end_date)
+
+    if not layers:
+        raise HTTPException(status_code=404, detail="No SAR data found for this period")
+
+    return layers
+
+
 @router.get("/thumbnail/{lga_id}")
 @limiter.limit("30/minute")
 def get_satellite_thumbnail(
     request: Request,
     lga_id: int,
-    date_str: Optional[str] = Query(None, alias="date"),
+    target_date: Optional[date] = Query(None, alias="date"),
     db: Session = Depends(get_db)
 ):
     """
@@ -100,23 +210,14 @@ def get_satellite_thumbnail(
         raise HTTPException(status_code=404, detail="LGA or geometry not found")
 
     try:
-        geometry = mapping(to_shape(lga.geometry))
+        geometry = mapping(
+            to_shape(lga.geometry).simplify(GEE_SIMPLIFY_TOLERANCE, preserve_topology=True)
+        )
     except (ShapelyError, ArgumentError, ValueError) as err:
         logger.exception("Invalid LGA geometry", extra={"lga_id": lga_id})
         raise HTTPException(status_code=500, detail="Invalid LGA geometry") from err
 
-    # Determine date range
-    if date_str:
-        try:
-            target_date = date.fromisoformat(date_str)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format")
-    else:
-        target_date = date.today()
-
-    # Window: 30 days
-    start_date = target_date - timedelta(days=30)
-    end_date = target_date
+    start_date, end_date = _sar_window(target_date)
 
     url = gee_service.get_sar_flood_thumbnail(geometry, start_date, end_date)
 
@@ -160,50 +261,15 @@ def get_latest_satellite_data(
     db: Session = Depends(get_db)
 ):
     """Get latest satellite data for LGAs with pagination."""
-    query = db.query(EnvironmentalData)
+    stmt = lambda_stmt(_latest_environmental_select)
 
     if lga_id:
-        query = query.filter(EnvironmentalData.lga_id == lga_id)
+        stmt += lambda s: s.where(EnvironmentalData.lga_id == lga_id)
 
-    # Get latest data for each LGA
-    from sqlalchemy import func
-    subquery = (
-        db.query(
-            EnvironmentalData.lga_id,
-            func.max(EnvironmentalData.observation_date).label("max_date")
-        )
-        .group_by(EnvironmentalData.lga_id)
-        .subquery()
-    )
-
-    latest = (
-        db.query(EnvironmentalData, LGA.name)
-        .join(LGA)
-        .join(
-            subquery,
-            (EnvironmentalData.lga_id == subquery.c.lga_id) &
-            (EnvironmentalData.observation_date == subquery.c.max_date)
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    stmt += lambda s: s.offset(skip).limit(limit)
 
-    return [
-        {
-            "lga_id": env.lga_id,
-            "lga_name": lga_name,
-            "observation_date": env.observation_date.isoformat(),
-            "rainfall_mm": env.rainfall_mm,
-            "rainfall_7day_mm": env.rainfall_7day_mm,
-            "ndwi": env.ndwi,
-            "flood_extent_pct": env.flood_extent_pct,
-            "flood_observed": env.flood_observed,
-            "lst_day": env.lst_day,
-            "data_source": env.data_source
-        }
-        for env, lga_name in latest
-    ]
+    payload, _ = _records_json(db.execute(stmt))
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/fetch")
@@ -223,25 +289,26 @@ async def fetch_satellite_data(
         end_date = date.today()
 
     # Get LGAs to process
+    # Only the IDs are needed; avoid loading geometry blobs for every LGA
+    stmt = select(LGA.id)
     if lga_id:
-        lgas = db.query(LGA).filter(LGA.id == lga_id).all()
-    else:
-        lgas = db.query(LGA).all()
+        stmt = stmt.where(LGA.id == lga_id)
+    lga_ids = db.execute(stmt).scalars().all()
 
-    if not lgas:
+    if not lga_ids:
         raise HTTPException(status_code=404, detail="No LGAs found")
 
     # Queue background fetch
     if background_tasks:
         background_tasks.add_task(
             fetch_data_for_lgas,
-            [lga.id for lga in lgas],
+            lga_ids,
             start_date,
             end_date
         )
         return {
             "success": True,
-            "message": f"Queued satellite data fetch for {len(lgas)} LGAs",
+            "message": f"Queued satellite data fetch for {len(lga_ids)} LGAs",
             "date_range": f"{start_date} to {end_date}"
         }
     else:
@@ -254,23 +321,27 @@ async def fetch_satellite_data(
 
 
 async def fetch_data_for_lgas(lga_ids: list, start_date: date, end_date: date):
-    """Background task to fetch satellite data for specified LGAs."""
+    """Background task to fetch satellite data for specified LGAs.
+
+    The GEE and NASA clients block on HTTP (getInfo has no async form), so
+    their calls run in the threadpool instead of stalling the event loop.
+    """
     gee_service = EarthEngineService()
     nasa_service = NASAGPMService()
 
-    for lga_id in lga_ids:
+    # Fetch GEE data (flood, NDWI, temperature) for all LGAs concurrently
+    if gee_service.is_authenticated():
         try:
-            # Fetch GEE data (flood, NDWI, temperature)
-            if gee_service.is_authenticated():
-                gee_service.fetch_data_for_lga(lga_id, start_date, end_date)
-
-            # Fetch NASA GPM data (rainfall)
-            if nasa_service.is_authenticated():
-                nasa_service.fetch_data_for_lga(lga_id, start_date, end_date)
+            await run_in_threadpool(gee_service.fetch_data_for_lgas, lga_ids, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error fetching GEE data for {len(lga_ids)} LGA(s): {e}")
 
+    # Fetch NASA GPM data (rainfall) for all LGAs with one upsert
+    if nasa_service.is_authenticated():
+        try:
+            await run_in_threadpool(nasa_service.fetch_data_for_lgas, lga_ids, start_date, end_date)
         except Exception as e:
-            logger.error(f"Error fetching data for LGA {lga_id}: {e}")
-            continue
+            logger.error(f"Error fetching GPM data for {len(lga_ids)} LGA(s): {e}")
 
 
 @router.get("/historical/{lga_id}")
@@ -285,8 +356,8 @@ def get_historical_environmental_data(
     db: Session = Depends(get_db)
 ):
     """Get historical environmental data for an LGA with pagination."""
-    lga = db.query(LGA).filter(LGA.id == lga_id).first()
-    if not lga:
+    lga_name = db.execute(select(LGA.name).where(LGA.id == lga_id)).scalar_one_or_none()
+    if lga_name is None:
         raise HTTPException(status_code=404, detail="LGA not found")
 
     if not start_date:
@@ -294,38 +365,62 @@ def get_historical_environmental_data(
     if not end_date:
         end_date = date.today()
 
-    query = (
-        db.query(EnvironmentalData)
-        .filter(
+    # Rows are upserted in place, so updated_at catches re-fetched days
+    # that leave the latest date and row count unchanged
+    latest_date, total, last_updated = db.execute(lambda_stmt(
+        lambda: select(
+            func.max(EnvironmentalData.observation_date),
+            func.count(EnvironmentalData.id),
+            func.max(EnvironmentalData.updated_at)
+        ).where(
+            EnvironmentalData.lga_id == lga_id,
+            EnvironmentalData.observation_date >= start_date,
+            EnvironmentalData.observation_date <= end_date
+        )
+    )).one()
+
+    # hashlib rather than hash(): the tag must be stable across worker processes
+    fingerprint = f"{lga_id}:{start_date}:{end_date}:{latest_date}:{total}:{last_updated}:{skip}:{limit}"
+    etag = f'W/"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    stmt = lambda_stmt(
+        lambda: select(
+            EnvironmentalData.observation_date.label("date"),
+            EnvironmentalData.rainfall_mm,
+            EnvironmentalData.rainfall_7day_mm,
+            EnvironmentalData.ndwi,
+            EnvironmentalData.flood_observed,
+            EnvironmentalData.lst_day,
+            EnvironmentalData.lst_night
+        )
+        .where(
             EnvironmentalData.lga_id == lga_id,
             EnvironmentalData.observation_date >= start_date,
             EnvironmentalData.observation_date <= end_date
         )
         .order_by(EnvironmentalData.observation_date)
     )
+    stmt += lambda s: s.offset(skip).limit(limit)
 
-    total = query.count()
-    data = query.offset(skip).limit(limit).all()
+    data, data_points = _records_json(db.execute(stmt))
 
-    return {
+    # Splice the pre-encoded records into the envelope instead of re-parsing them
+    envelope = orjson.dumps({
         "lga_id": lga_id,
-        "lga_name": lga.name,
+        "lga_name": lga_name,
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
         "total": total,
         "skip": skip,
         "limit": limit,
-        "data_points": len(data),
-        "data": [
-            {
-                "date": d.observation_date.isoformat(),
-                "rainfall_mm": d.rainfall_mm,
-                "rainfall_7day_mm": d.rainfall_7day_mm,
-                "ndwi": d.ndwi,
-                "flood_observed": d.flood_observed,
-                "lst_day": d.lst_day,
-                "lst_night": d.lst_night
-            }
-            for d in data
-        ]
-    }
+        "data_points": data_points,
+    })
+    return Response(
+        content=envelope[:-1] + b',"data":' + data + b"}",
+        media_type="application/json",
+        headers=headers
+    )
@@ -3,14 +3,15 @@ import os
 import io
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
+import orjson
 import pandas as pd
 
 from app.database import get_db
 from app.models import LGA, CaseReport
 from app.schemas import UploadResponse
-from app.services.data_importer import DataImporter
+from app.services.data_importer import DataImporter, EXCEL_ENGINE
 from app.services.risk_calculator import RiskCalculator
 from app.rate_limiter import limiter
 
@@ -19,6 +20,49 @@ router = APIRouter(prefix="/api/upload", tags=["Upload"])
 # Maximum file size: 10MB
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Upload templates never change at runtime, so serialize them once at import
+_TEMPLATES = {
+    "cases": orjson.dumps({
+        "description": "Template for cholera case data upload",
+        "columns": [
+            {"name": "lga_name", "type": "string", "required": True, "description": "Name of the LGA"},
+            {"name": "report_date", "type": "date (YYYY-MM-DD)", "required": True, "description": "Date of report"},
+            {"name": "new_cases", "type": "integer", "required": True, "description": "Number of new cases"},
+            {"name": "deaths", "type": "integer", "required": False, "description": "Number of deaths"},
+            {"name": "suspected_cases", "type": "integer", "required": False, "description": "Number of suspected cases"},
+            {"name": "confirmed_cases", "type": "integer", "required": False, "description": "Number of confirmed cases"},
+            {"name": "recoveries", "type": "integer", "required": False, "description": "Number of recoveries"},
+            {"name": "ward_name", "type": "string", "required": False, "description": "Ward name if available"}
+        ],
+        "example_row": {
+            "lga_name": "Calabar Municipal",
+            "report_date": "2024-01-15",
+            "new_cases": 5,
+            "deaths": 0,
+            "suspected_cases": 3,
+            "confirmed_cases": 2
+        }
+    }),
+    "environmental": orjson.dumps({
+        "description": "Template for environmental data upload",
+        "columns": [
+            {"name": "lga_name", "type": "string", "required": True, "description": "Name of the LGA"},
+            {"name": "observation_date", "type": "date (YYYY-MM-DD)", "required": True, "description": "Date of observation"},
+            {"name": "rainfall_mm", "type": "float", "required": False, "description": "Daily rainfall in mm"},
+            {"name": "flood_observed", "type": "boolean", "required": False, "description": "Was flooding observed?"},
+            {"name": "ndwi", "type": "float (-1 to 1)", "required": False, "description": "Normalized Difference Water Index"}
+        ],
+        "example_row": {
+            "lga_name": "Calabar Municipal",
+            "observation_date": "2024-01-15",
+            "rainfall_mm": 25.5,
+            "flood_observed": False,
+            "ndwi": 0.2
+        }
+    }),
+}
+_TEMPLATE_HEADERS = {"Cache-Control": "public, max-age=86400, immutable"}
+
 
 @router.post("", response_model=UploadResponse)
 @limiter.limit("10/minute")
@@ -54,7 +98,7 @@ async def upload_data(
         if file_ext == ".csv":
             df = pd.read_csv(io.BytesIO(content))
         else:
-            df = pd.read_excel(io.BytesIO(content))
+            df = pd.read_excel(io.BytesIO(content), engine=EXCEL_ENGINE)
 
         # Import data
         importer = DataImporter(db)
@@ -119,48 +163,10 @@ def recalculate_risks(db: Session):
 
 
 @router.get("/template/{data_type}")
-@limiter.limit("60/minute")
+@limiter.limit("600/minute")
 def get_upload_template(request: Request, data_type: str):
     """Get CSV template for data upload."""
-    if data_type == "cases":
-        return {
-            "description": "Template for cholera case data upload",
-            "columns": [
-                {"name": "lga_name", "type": "string", "required": True, "description": "Name of the LGA"},
-                {"name": "report_date", "type": "date (YYYY-MM-DD)", "required": True, "description": "Date of report"},
-                {"name": "new_cases", "type": "integer", "required": True, "description": "Number of new cases"},
-                {"name": "deaths", "type": "integer", "required": False, "description": "Number of deaths"},
-                {"name": "suspected_cases", "type": "integer", "required": False, "description": "Number of suspected cases"},
-                {"name": "confirmed_cases", "type": "integer", "required": False, "description": "Number of confirmed cases"},
-                {"name": "recoveries", "type": "integer", "required": False, "description": "Number of recoveries"},
-                {"name": "ward_name", "type": "string", "required": False, "description": "Ward name if available"}
-            ],
-            "example_row": {
-                "lga_name": "Calabar Municipal",
-                "report_date": "2024-01-15",
-                "new_cases": 5,
-                "deaths": 0,
-                "suspected_cases": 3,
-                "confirmed_cases": 2
-            }
-        }
-    elif data_type == "environmental":
-        return {
-            "description": "Template for environmental data upload",
-            "columns": [
-                {"name": "lga_name", "type": "string", "required": True, "description": "Name of the LGA"},
-                {"name": "observation_date", "type": "date (YYYY-MM-DD)", "required": True, "description": "Date of observation"},
-                {"name": "rainfall_mm", "type": "float", "required": False, "description": "Daily rainfall in mm"},
-                {"name": "flood_observed", "type": "boolean", "required": False, "description": "Was flooding observed?"},
-                {"name": "ndwi", "type": "float (-1 to 1)", "required": False, "description": "Normalized Difference Water Index"}
-            ],
-            "example_row": {
-                "lga_name": "Calabar Municipal",
-                "observation_date": "2024-01-15",
-                "rainfall_mm": 25.5,
-                "flood_observed": False,
-                "ndwi": 0.2
-            }
-        }
-    else:
+    body = _TEMPLATES.get(data_type)
+    if body is None:
         raise HTTPException(status_code=400, detail="Invalid data_type. Use 'cases' or 'environmental'")
+    return Response(content=body, media_type="application/json", headers=_TEMPLATE_HEADERS)
@@ -1,7 +1,7 @@
 """Pydantic schemas for API validation and serialization."""
 from datetime import datetime, date
 from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ============ LGA Schemas ============
@@ -35,8 +35,7 @@ class LGAResponse(LGABase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class LGAWithGeometry(LGAResponse):
@@ -93,8 +92,7 @@ class CaseReportResponse(CaseReportBase):
     source: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ============ Environmental Data Schemas ============
@@ -131,8 +129,7 @@ class EnvironmentalDataResponse(EnvironmentalDataBase):
     lst_night: Optional[float] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ============ Risk Score Schemas ============
@@ -169,8 +166,7 @@ class RiskScoreResponse(RiskScoreBase):
     calculated_at: datetime
     algorithm_version: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class RiskScoreWithLGA(RiskScoreResponse):
@@ -205,8 +201,7 @@ class AlertResponse(AlertBase):
     resolved_at: Optional[datetime] = None
     is_active: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class AlertWithLGA(AlertResponse):
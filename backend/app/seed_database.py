@@ -12,29 +12,81 @@ Usage:
     cd backend
     python -m app.seed_database
 """
-import json
 import os
 import sys
 from datetime import date, timedelta, datetime
-import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+import ijson
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from geoalchemy2.shape import from_shape
+import shapely
+from geoalchemy2.elements import WKBElement
 from shapely.geometry import shape, MultiPolygon
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
 
+from app.bulk_load import copy_rows
 from app.database import engine, SessionLocal, Base, init_db
 from app.models import LGA, CaseReport, EnvironmentalData, RiskScore, Alert
 from app.services.risk_calculator import RiskCalculator
 
+# Shared generator for all demo data; seeded so reruns on an empty database
+# produce the same scenario
+rng = np.random.default_rng(42)
 
-def to_postgis_multipolygon(geometry: dict):
-    """Convert GeoJSON geometry to PostGIS MultiPolygon format."""
+# Below this many features, worker process startup costs more than the
+# geometry conversion itself
+PARALLEL_GEOMETRY_THRESHOLD = 200
+
+# Demo scenario LGA tiers
+TIER_OTHER = 0
+TIER_NEIGHBOR = 1
+TIER_EPICENTER = 2
+
+# Features buffered per INSERT when streaming the GeoJSON file
+GEOJSON_CHUNK_SIZE = 1000
+
+
+def to_multipolygon(geometry: dict) -> MultiPolygon:
+    """Convert GeoJSON geometry to a shapely MultiPolygon."""
     geom_shape = shape(geometry)
     if geom_shape.geom_type == 'Polygon':
         geom_shape = MultiPolygon([geom_shape])
-    return from_shape(geom_shape, srid=4326)
+    return geom_shape
+
+
+def to_ewkb_hex(geom_shape) -> str:
+    """Serialize a shapely geometry straight to hex EWKB (SRID 4326) in GEOS."""
+    return shapely.to_wkb(shapely.set_srid(geom_shape, 4326), hex=True, include_srid=True)
+
+
+def to_postgis_multipolygon(geometry: dict):
+    """Convert GeoJSON geometry to PostGIS MultiPolygon format."""
+    return WKBElement(to_ewkb_hex(to_multipolygon(geometry)), srid=4326, extended=True)
+
+
+def convert_feature_geometry(geometry: dict) -> Tuple[str, float, float]:
+    """Convert GeoJSON geometry to MultiPolygon EWKB and its centroid.
+
+    Kept at module level and returning plain values so it can run in worker
+    processes without pickling shapely or SQLAlchemy objects.
+
+    Returns:
+        Tuple of (hex EWKB, centroid longitude, centroid latitude).
+    """
+    geom_shape = to_multipolygon(geometry)
+    if geom_shape.is_empty:
+        return to_ewkb_hex(geom_shape), 8.5, 5.5
+
+    # Area-weighted centroid computed by GEOS
+    centroid = geom_shape.centroid
+    return to_ewkb_hex(geom_shape), centroid.x, centroid.y
 
 
 def create_tables():
@@ -44,8 +96,38 @@ def create_tables():
     print("Tables created successfully.")
 
 
-def load_lga_geojson():
-    """Load LGA boundaries from GeoJSON file."""
+def bulk_load_indexes():
+    """Secondary indexes on the bulk-loaded tables.
+
+    Unique constraints are not included: ON CONFLICT needs them during the load.
+    """
+    return [
+        index
+        for table in (EnvironmentalData.__table__, CaseReport.__table__)
+        for index in table.indexes
+    ]
+
+
+def drop_bulk_load_indexes():
+    """Drop secondary indexes so the bulk inserts skip per-row index maintenance."""
+    print("Dropping secondary indexes for bulk load...")
+    with engine.begin() as conn:
+        for index in bulk_load_indexes():
+            index.drop(conn, checkfirst=True)
+
+
+def restore_bulk_load_indexes():
+    """Rebuild the secondary indexes in one pass and refresh planner statistics."""
+    print("Rebuilding secondary indexes and analyzing tables...")
+    with engine.begin() as conn:
+        for index in bulk_load_indexes():
+            index.create(conn, checkfirst=True)
+        for table in (EnvironmentalData.__table__, CaseReport.__table__):
+            conn.execute(text(f"ANALYZE {table.name}"))
+
+
+def find_lga_geojson() -> Optional[str]:
+    """Locate the LGA boundaries GeoJSON file."""
     geojson_path = os.path.join(
         os.path.dirname(__file__),
         "..",
@@ -57,73 +139,108 @@ def load_lga_geojson():
         print(f"GeoJSON file not found at {geojson_path}")
         return None
 
-    with open(geojson_path, "r") as f:
-        return json.load(f)
+    return geojson_path
+
 
+def iter_lga_features(geojson_path: str) -> Iterator[dict]:
+    """Stream features from a GeoJSON FeatureCollection one at a time.
 
-def seed_lgas():
-    """Seed LGA data from GeoJSON."""
+    Parsing incrementally keeps peak memory proportional to a single feature
+    rather than the whole file.
+    """
+    with open(geojson_path, "rb") as f:
+        yield from ijson.items(f, "features.item", use_float=True)
+
+
+def build_lga_rows(features: List[dict]) -> List[dict]:
+    """Convert GeoJSON features into LGA insert mappings."""
+    # Convert GeoJSON geometry to PostGIS format (ensure MultiPolygon),
+    # fanning out to worker processes only for large inputs
+    geometries = [feature["geometry"] for feature in features]
+    if len(geometries) >= PARALLEL_GEOMETRY_THRESHOLD:
+        with ProcessPoolExecutor() as pool:
+            converted = list(pool.map(convert_feature_geometry, geometries, chunksize=16))
+    else:
+        converted = [convert_feature_geometry(geometry) for geometry in geometries]
+
+    lga_rows = []
+    for feature, (ewkb, centroid_lon, centroid_lat) in zip(features, converted):
+        props = feature["properties"]
+        lga_rows.append({
+            "name": props["name"],
+            "code": props["code"],
+            "population": props.get("population"),
+            "headquarters": props.get("headquarters"),
+            "centroid_lat": centroid_lat,
+            "centroid_lon": centroid_lon,
+            "water_coverage_pct": float(rng.uniform(40, 80)),
+            "sanitation_coverage_pct": float(rng.uniform(35, 70)),
+            "health_facilities_count": int(rng.integers(3, 15, endpoint=True)),
+            "geometry": WKBElement(ewkb, srid=4326, extended=True)
+        })
+        print(f"  Added LGA: {props['name']}")
+
+    return lga_rows
+
+
+def seed_lgas(db: Optional[Session] = None):
+    """Seed LGA data from GeoJSON.
+
+    Features are streamed from the file and inserted in chunks of
+    GEOJSON_CHUNK_SIZE.
+
+    Args:
+        db: Optional session to run in. When given, the caller owns the
+            transaction and nothing is committed here.
+    """
     print("Seeding LGA data...")
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
 
     try:
-        geojson = load_lga_geojson()
-        if not geojson:
+        geojson_path = find_lga_geojson()
+        if not geojson_path:
             print("Could not load GeoJSON, using hardcoded LGA data...")
             seed_lgas_hardcoded(db)
+            if owns_session:
+                db.commit()
             return
 
-        for feature in geojson["features"]:
-            props = feature["properties"]
-            geometry = feature["geometry"]
-
-            # Calculate centroid from geometry
-            coords = geometry["coordinates"][0]
-            if coords:
-                lons = [c[0] for c in coords]
-                lats = [c[1] for c in coords]
-                centroid_lon = sum(lons) / len(lons)
-                centroid_lat = sum(lats) / len(lats)
-            else:
-                centroid_lon = 8.5
-                centroid_lat = 5.5
-
-            # Check if LGA exists
-            existing = db.query(LGA).filter(LGA.name == props["name"]).first()
-
-            if existing:
-                print(f"  LGA {props['name']} already exists, skipping...")
-                continue
+        existing_names = set(db.execute(select(LGA.name)).scalars().all())
+
+        feature_count = 0
+        features_iter = iter_lga_features(geojson_path)
+        while True:
+            chunk = list(islice(features_iter, GEOJSON_CHUNK_SIZE))
+            if not chunk:
+                break
+            feature_count += len(chunk)
+
+            features = []
+            for feature in chunk:
+                # Check if LGA exists
+                if feature["properties"]["name"] in existing_names:
+                    print(f"  LGA {feature['properties']['name']} already exists, skipping...")
+                    continue
+                features.append(feature)
 
-            # Convert GeoJSON geometry to PostGIS format (ensure MultiPolygon)
-            # Convert GeoJSON geometry to PostGIS format (ensure MultiPolygon)
-            postgis_geom = to_postgis_multipolygon(geometry)
-
-            lga = LGA(
-                name=props["name"],
-                code=props["code"],
-                population=props.get("population"),
-                headquarters=props.get("headquarters"),
-                centroid_lat=centroid_lat,
-                centroid_lon=centroid_lon,
-                water_coverage_pct=random.uniform(40, 80),
-                sanitation_coverage_pct=random.uniform(35, 70),
-                health_facilities_count=random.randint(3, 15),
-                geometry=postgis_geom
-            )
-
-            db.add(lga)
-            print(f"  Added LGA: {props['name']}")
+            lga_rows = build_lga_rows(features)
+            if lga_rows:
+                db.execute(insert(LGA), lga_rows)
 
-        db.commit()
-        print(f"Seeded {len(geojson['features'])} LGAs successfully.")
+        if owns_session:
+            db.commit()
+        print(f"Seeded {feature_count} LGAs successfully.")
 
     except Exception as e:
         print(f"Error seeding LGAs: {e}")
-        db.rollback()
+        if owns_session:
+            db.rollback()
         raise
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
 def seed_lgas_hardcoded(db):
@@ -149,9 +266,11 @@ def seed_lgas_hardcoded(db):
         ("Yala", "CRS-YAL", 216118, "Okpoma", 6.45, 8.62),
     ]
 
+    existing_names = set(db.execute(select(LGA.name)).scalars().all())
+
+    lga_rows = []
     for name, code, pop, hq, lat, lon in lgas_data:
-        existing = db.query(LGA).filter(LGA.name == name).first()
-        if existing:
+        if name in existing_names:
             continue
 
         # Create simple polygon geometry around centroid
@@ -171,25 +290,25 @@ def seed_lgas_hardcoded(db):
         # Convert GeoJSON geometry to PostGIS format (ensure MultiPolygon)
         postgis_geom = to_postgis_multipolygon(geometry)
 
-        lga = LGA(
-            name=name,
-            code=code,
-            population=pop,
-            headquarters=hq,
-            centroid_lat=lat,
-            centroid_lon=lon,
-            water_coverage_pct=random.uniform(40, 80),
-            sanitation_coverage_pct=random.uniform(35, 70),
-            health_facilities_count=random.randint(3, 15),
-            geometry=postgis_geom
-        )
-        db.add(lga)
+        lga_rows.append({
+            "name": name,
+            "code": code,
+            "population": pop,
+            "headquarters": hq,
+            "centroid_lat": lat,
+            "centroid_lon": lon,
+            "water_coverage_pct": float(rng.uniform(40, 80)),
+            "sanitation_coverage_pct": float(rng.uniform(35, 70)),
+            "health_facilities_count": int(rng.integers(3, 15, endpoint=True)),
+            "geometry": postgis_geom
+        })
         print(f"  Added LGA: {name}")
 
-    db.commit()
+    if lga_rows:
+        db.execute(insert(LGA), lga_rows)
 
 
-def seed_demo_scenario():
+def seed_demo_scenario(db: Optional[Session] = None):
     """
     Create a compelling demo scenario:
     - Heavy rain 4 weeks ago
@@ -197,9 +316,15 @@ def seed_demo_scenario():
     - First cases 3 weeks ago
     - Outbreak peaks 4 days ago (within 14-day risk window)
     - Intervention showing effect (cases declining slightly)
+
+    Args:
+        db: Optional session to run in. When given, the caller owns the
+            transaction and nothing is committed here.
     """
     print("Seeding demo scenario data...")
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
 
     try:
         lgas = db.query(LGA).all()
@@ -207,228 +332,284 @@ def seed_demo_scenario():
             print("No LGAs found. Please seed LGAs first.")
             return
 
-        # Create LGA lookup
-        lga_dict = {lga.name: lga for lga in lgas}
-
         # Define outbreak epicenters
-        epicenter_lgas = ["Calabar South", "Odukpani"]
+        epicenter_lgas = frozenset({"Calabar South", "Odukpani"})
 
         # Define neighboring LGAs with moderate risk
-        neighbor_lgas = ["Calabar Municipal", "Akpabuyo", "Akamkpa", "Biase"]
+        neighbor_lgas = frozenset({"Calabar Municipal", "Akpabuyo", "Akamkpa", "Biase"})
 
         # Reference dates for the scenario
         today = date.today()
 
         # Environmental data timeline
         print("  Creating environmental data...")
-        seed_environmental_scenario(db, lgas, lga_dict, epicenter_lgas, neighbor_lgas, today)
+        seed_environmental_scenario(db, lgas, epicenter_lgas, neighbor_lgas, today)
 
         # Case data timeline
         print("  Creating cholera case data...")
-        seed_case_scenario(db, lgas, lga_dict, epicenter_lgas, neighbor_lgas, today)
+        seed_case_scenario(db, lgas, epicenter_lgas, neighbor_lgas, today)
 
-        db.commit()
+        if owns_session:
+            db.commit()
         print("Demo scenario data created successfully.")
 
     except Exception as e:
         print(f"Error seeding demo scenario: {e}")
-        db.rollback()
+        if owns_session:
+            db.rollback()
         raise
     finally:
-        db.close()
+        if owns_session:
+            db.close()
+
+
+def trailing_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum each column over a trailing window of rows using a cumulative sum."""
+    csum = np.cumsum(values, axis=0)
+    shifted = np.zeros_like(csum)
+    shifted[window:] = csum[:-window]
+    return csum - shifted
+
+
+def lga_tiers(lgas, epicenter_lgas, neighbor_lgas) -> List[int]:
+    """Classify each LGA once as epicenter, neighbor or other."""
+    epicenter_set = frozenset(epicenter_lgas)
+    neighbor_set = frozenset(neighbor_lgas)
+    return [
+        TIER_EPICENTER if lga.name in epicenter_set
+        else TIER_NEIGHBOR if lga.name in neighbor_set
+        else TIER_OTHER
+        for lga in lgas
+    ]
 
 
-def seed_environmental_scenario(db, lgas, lga_dict, epicenter_lgas, neighbor_lgas, today):
-    """Create environmental data for the demo scenario."""
+def seed_environmental_scenario(db, lgas, epicenter_lgas, neighbor_lgas, today):
+    """Create environmental data for the demo scenario.
 
+    All values are drawn at once as (day, LGA) matrices; the per-regime
+    uniform bounds are selected with boolean masks instead of drawing one
+    scalar at a time.
+    """
     # Timeline
     heavy_rain_start = today - timedelta(days=28)  # 4 weeks ago
     heavy_rain_end = today - timedelta(days=24)
     flood_peak = today - timedelta(days=21)  # 3 weeks ago
+    flood_window_start = flood_peak - timedelta(days=3)
+    flood_window_end = flood_peak + timedelta(days=14)
 
     # Create data for past 60 days
-    for days_ago in range(60, -1, -1):
-        current_date = today - timedelta(days=days_ago)
+    dates = [today - timedelta(days=days_ago) for days_ago in range(60, -1, -1)]
+    grid = (len(dates), len(lgas))
+
+    tiers = np.array(lga_tiers(lgas, epicenter_lgas, neighbor_lgas))
+    is_epicenter = (tiers == TIER_EPICENTER)[None, :]
+    is_neighbor = (tiers == TIER_NEIGHBOR)[None, :]
+
+    # Day masks, broadcast against the LGA axis
+    heavy_rain = np.array([heavy_rain_start <= d <= heavy_rain_end for d in dates])[:, None]
+    before_rain = np.array([d < heavy_rain_start for d in dates])[:, None]
+    flood_period = np.array([flood_window_start <= d <= flood_window_end for d in dates])[:, None]
+    receding = np.array([d > flood_window_end for d in dates])[:, None]
+
+    # After the rain event rainfall tapers off towards zero
+    days_since_rain = np.array([(d - heavy_rain_end).days for d in dates])[:, None]
+    taper_high = np.maximum(0, 20 - days_since_rain * 0.8)
+
+    # Rainfall: heavy event by LGA group, normal before, tapering after
+    rain_low = np.select(
+        [heavy_rain & is_epicenter, heavy_rain & is_neighbor, heavy_rain],
+        [35, 25, 15],
+        default=0
+    )
+    rain_high = np.select(
+        [heavy_rain & is_epicenter, heavy_rain & is_neighbor, heavy_rain, before_rain],
+        [65, 45, 35, 15],
+        default=taper_high
+    )
+    rainfall_mm = rng.uniform(rain_low, rain_high, size=grid)
 
-        # Generate data for all days to ensure recent coverage
-        # if current_date.day % 2 != 0:
-        #     continue
-
-        for lga in lgas:
-            is_epicenter = lga.name in epicenter_lgas
-            is_neighbor = lga.name in neighbor_lgas
-
-            # Determine rainfall based on timeline
-            if heavy_rain_start <= current_date <= heavy_rain_end:
-                # Heavy rain event
-                if is_epicenter:
-                    rainfall_mm = random.uniform(35, 65)
-                elif is_neighbor:
-                    rainfall_mm = random.uniform(25, 45)
-                else:
-                    rainfall_mm = random.uniform(15, 35)
-            elif current_date < heavy_rain_start:
-                # Before rain event - normal
-                rainfall_mm = random.uniform(0, 15)
-            else:
-                # After rain event - tapering off
-                days_since_rain = (current_date - heavy_rain_end).days
-                base_rain = max(0, 20 - days_since_rain * 0.8)
-                rainfall_mm = random.uniform(0, base_rain)
-
-            # Calculate cumulative rainfall
-            # For demo, approximate 7-day and 30-day values
-            rainfall_7day = rainfall_mm * random.uniform(4, 7)
-            rainfall_30day = rainfall_mm * random.uniform(15, 25)
-
-            # NDWI and flooding patterns
-            if current_date >= flood_peak - timedelta(days=3) and current_date <= flood_peak + timedelta(days=14):
-                # Peak flooding period (3 weeks ago to 1 week ago)
-                if is_epicenter:
-                    ndwi = random.uniform(0.45, 0.75)
-                    flood_extent_pct = random.uniform(15, 35)
-                    flood_observed = True
-                elif is_neighbor:
-                    ndwi = random.uniform(0.35, 0.55)
-                    flood_extent_pct = random.uniform(8, 18)
-                    flood_observed = random.random() > 0.3
-                else:
-                    ndwi = random.uniform(0.15, 0.35)
-                    flood_extent_pct = random.uniform(0, 8)
-                    flood_observed = random.random() > 0.8
-            elif current_date > flood_peak + timedelta(days=14):
-                # Flooding receding
-                if is_epicenter:
-                    # Keep flood indicators higher for epicenters
-                    ndwi = random.uniform(0.35, 0.55)
-                    flood_extent_pct = random.uniform(10, 22)
-                    flood_observed = random.random() > 0.3
-                elif is_neighbor:
-                    ndwi = random.uniform(0.20, 0.40)
-                    flood_extent_pct = random.uniform(4, 12)
-                    flood_observed = random.random() > 0.6
-                else:
-                    ndwi = random.uniform(0.05, 0.25)
-                    flood_extent_pct = random.uniform(0, 5)
-                    flood_observed = False
-            else:
-                # Normal conditions
-                ndwi = random.uniform(-0.1, 0.2)
-                flood_extent_pct = random.uniform(0, 3)
-                flood_observed = False
-
-            # Temperature (relatively stable)
-            lst_day = random.uniform(30, 34)
-            lst_night = random.uniform(23, 26)
-
-            # Check if record exists
-            existing = db.query(EnvironmentalData).filter(
-                EnvironmentalData.lga_id == lga.id,
-                EnvironmentalData.observation_date == current_date
-            ).first()
-
-            if not existing:
-                env_data = EnvironmentalData(
-                    lga_id=lga.id,
-                    observation_date=current_date,
-                    rainfall_mm=round(rainfall_mm, 2),
-                    rainfall_7day_mm=round(rainfall_7day, 2),
-                    rainfall_30day_mm=round(rainfall_30day, 2),
-                    ndwi=round(ndwi, 3),
-                    flood_extent_pct=round(flood_extent_pct, 2),
-                    flood_observed=flood_observed,
-                    lst_day=round(lst_day, 2),
-                    lst_night=round(lst_night, 2),
-                    data_source="demo_scenario"
-                )
-                db.add(env_data)
-
-
-def seed_case_scenario(db, lgas, lga_dict, epicenter_lgas, neighbor_lgas, today):
+    # Cumulative rainfall as true trailing sums (partial at the start of the series)
+    rainfall_7day = trailing_sum(rainfall_mm, 7)
+    rainfall_30day = trailing_sum(rainfall_mm, 30)
+
+    # NDWI and flooding patterns. flood_observed is drawn as random > threshold,
+    # with -1 meaning always observed and 1 meaning never observed.
+    regimes = [
+        flood_period & is_epicenter, flood_period & is_neighbor, flood_period,
+        receding & is_epicenter, receding & is_neighbor, receding,
+    ]
+    ndwi = rng.uniform(
+        np.select(regimes, [0.45, 0.35, 0.15, 0.35, 0.20, 0.05], default=-0.1),
+        np.select(regimes, [0.75, 0.55, 0.35, 0.55, 0.40, 0.25], default=0.2),
+        size=grid
+    )
+    flood_extent_pct = rng.uniform(
+        np.select(regimes, [15, 8, 0, 10, 4, 0], default=0),
+        np.select(regimes, [35, 18, 8, 22, 12, 5], default=3),
+        size=grid
+    )
+    flood_threshold = np.select(regimes, [-1, 0.3, 0.8, 0.3, 0.6, 1], default=1)
+    flood_observed = rng.random(grid) > flood_threshold
+
+    # Temperature (relatively stable)
+    lst_day = rng.uniform(30, 34, size=grid)
+    lst_night = rng.uniform(23, 26, size=grid)
+
+    # Accumulate plain dicts and insert them in one batch at the end
+    env_rows = []
+    columns = zip(
+        np.round(rainfall_mm, 2).tolist(),
+        np.round(rainfall_7day, 2).tolist(),
+        np.round(rainfall_30day, 2).tolist(),
+        np.round(ndwi, 3).tolist(),
+        np.round(flood_extent_pct, 2).tolist(),
+        flood_observed.tolist(),
+        np.round(lst_day, 2).tolist(),
+        np.round(lst_night, 2).tolist(),
+    )
+    for current_date, day_values in zip(dates, columns):
+        for lga, values in zip(lgas, zip(*day_values)):
+            env_rows.append({
+                "lga_id": lga.id,
+                "observation_date": current_date,
+                "rainfall_mm": values[0],
+                "rainfall_7day_mm": values[1],
+                "rainfall_30day_mm": values[2],
+                "ndwi": values[3],
+                "flood_extent_pct": values[4],
+                "flood_observed": values[5],
+                "lst_day": values[6],
+                "lst_night": values[7],
+                "data_source": "demo_scenario"
+            })
+
+    # COPY through a staging table; existing (lga_id, date) rows are skipped
+    copy_rows(db, EnvironmentalData.__table__, env_rows, ["lga_id", "observation_date"])
+
+
+def _scale(u: float, low: float, high: float) -> float:
+    """Map a pre-drawn [0, 1) uniform onto [low, high)."""
+    return low + (high - low) * u
+
+
+def _scale_int(u: float, low: int, high: int) -> int:
+    """Map a pre-drawn [0, 1) uniform onto the integers low..high inclusive."""
+    return low + int(u * (high - low + 1))
+
+
+def seed_case_scenario(db, lgas, epicenter_lgas, neighbor_lgas, today):
     """Create cholera case data for the demo scenario."""
 
     # Timeline - adjusted to have peak within 14-day risk window
     first_cases = today - timedelta(days=21)  # 3 weeks ago
     outbreak_peak = today - timedelta(days=4)  # 4 days ago (within 14-day window!)
+    peak_end = outbreak_peak + timedelta(days=4)
+    days_to_peak = (outbreak_peak - first_cases).days
 
     # Case fatality rate
     cfr = 0.015  # 1.5% CFR
 
+    case_rows = []
+
+    # Pre-draw every random value for the (day, LGA) grid in one go. Each cell
+    # gets a presence gate, a secondary gate, a magnitude draw and the
+    # death/confirmation noise; the loop below only maps them onto the
+    # scenario's ranges.
+    n_days = 41
+    grid = (n_days, len(lgas))
+    day_skip = rng.random(n_days)
+    gates = rng.random(grid)
+    second_gates = rng.random(grid)
+    magnitudes = rng.random(grid)
+    death_noise = rng.uniform(-0.5, 0.5, size=grid)
+    death_gates = rng.random(grid)
+    confirmed_frac = rng.uniform(0.6, 0.9, size=grid)
+
+    # LGA tier does not change from day to day
+    lga_groups = list(zip(
+        (lga.id for lga in lgas), lga_tiers(lgas, epicenter_lgas, neighbor_lgas)
+    ))
+
     # Create case data
-    for days_ago in range(40, -1, -1):
+    for i, days_ago in enumerate(range(n_days - 1, -1, -1)):
         current_date = today - timedelta(days=days_ago)
 
         # Skip some days randomly (not every day has reports)
-        if current_date < first_cases and random.random() < 0.7:
+        if current_date < first_cases and day_skip[i] < 0.7:
             continue
 
-        for lga in lgas:
-            is_epicenter = lga.name in epicenter_lgas
-            is_neighbor = lga.name in neighbor_lgas
+        # Outbreak phase and its curve factor depend only on the day
+        if current_date < first_cases:
+            phase = "baseline"
+        elif current_date < outbreak_peak:
+            phase = "buildup"
+            # Growth curve - exponential-ish growth
+            growth_factor = ((current_date - first_cases).days / days_to_peak) ** 1.5
+        elif current_date < peak_end:
+            phase = "peak"
+        else:
+            phase = "decline"
+            # Slower decline to keep cases high recently
+            decline_factor = max(0.3, 1 - ((current_date - outbreak_peak).days / 20))
+
+        for j, (lga_id, tier) in enumerate(lga_groups):
+            gate = gates[i, j]
+            second_gate = second_gates[i, j]
+            magnitude = magnitudes[i, j]
 
             # Before outbreak - baseline/sporadic cases
-            if current_date < first_cases:
-                if is_epicenter and random.random() < 0.1:
-                    new_cases = random.randint(0, 2)
-                elif random.random() < 0.05:
-                    new_cases = random.randint(0, 1)
+            if phase == "baseline":
+                if tier == TIER_EPICENTER and gate < 0.1:
+                    new_cases = _scale_int(magnitude, 0, 2)
+                elif second_gate < 0.05:
+                    new_cases = _scale_int(magnitude, 0, 1)
                 else:
                     continue
             # During outbreak buildup (first_cases to peak)
-            elif current_date < outbreak_peak:
-                days_into_outbreak = (current_date - first_cases).days
-                days_to_peak = (outbreak_peak - first_cases).days
-
-                # Growth curve - exponential-ish growth
-                growth_factor = (days_into_outbreak / days_to_peak) ** 1.5
-
-                if is_epicenter:
+            elif phase == "buildup":
+                if tier == TIER_EPICENTER:
                     base_cases = 35  # Increased from 25
-                    new_cases = int(base_cases * growth_factor * random.uniform(0.8, 1.4))
+                    new_cases = int(base_cases * growth_factor * _scale(magnitude, 0.8, 1.4))
                     # Ensure at least some cases
                     new_cases = max(3, new_cases)
-                elif is_neighbor:
+                elif tier == TIER_NEIGHBOR:
                     base_cases = 15  # Increased from 10
-                    new_cases = int(base_cases * growth_factor * random.uniform(0.7, 1.3))
-                    if random.random() < 0.7:
+                    new_cases = int(base_cases * growth_factor * _scale(magnitude, 0.7, 1.3))
+                    if gate < 0.7:
                         new_cases = max(2, new_cases)
                     else:
                         new_cases = 0
                 else:
                     # Low risk areas - occasional cases
-                    if random.random() < 0.2:
-                        new_cases = random.randint(0, 4)
+                    if gate < 0.2:
+                        new_cases = _scale_int(magnitude, 0, 4)
                     else:
                         continue
             # Peak period (around outbreak_peak) - 4 days window
-            elif current_date >= outbreak_peak and current_date < outbreak_peak + timedelta(days=4):
-                if is_epicenter:
-                    new_cases = random.randint(30, 45)  # Increased from 20-35
-                elif is_neighbor:
-                    new_cases = random.randint(12, 22)  # Increased from 8-16
+            elif phase == "peak":
+                if tier == TIER_EPICENTER:
+                    new_cases = _scale_int(magnitude, 30, 45)  # Increased from 20-35
+                elif tier == TIER_NEIGHBOR:
+                    new_cases = _scale_int(magnitude, 12, 22)  # Increased from 8-16
                 else:
-                    if random.random() < 0.3:
-                        new_cases = random.randint(1, 6)
+                    if gate < 0.3:
+                        new_cases = _scale_int(magnitude, 1, 6)
                     else:
                         continue
             # Decline phase (after peak) - still high but declining
             else:
-                days_since_peak = (current_date - outbreak_peak).days
-                # Slower decline to keep cases high recently
-                decline_factor = max(0.3, 1 - (days_since_peak / 20))
-
-                if is_epicenter:
-                    new_cases = int(35 * decline_factor * random.uniform(0.7, 1.2))
+                if tier == TIER_EPICENTER:
+                    new_cases = int(35 * decline_factor * _scale(magnitude, 0.7, 1.2))
                     new_cases = max(5, new_cases)
-                elif is_neighbor:
-                    new_cases = int(18 * decline_factor * random.uniform(0.6, 1.1))
-                    if random.random() < 0.7:
+                elif tier == TIER_NEIGHBOR:
+                    new_cases = int(18 * decline_factor * _scale(magnitude, 0.6, 1.1))
+                    if gate < 0.7:
                         new_cases = max(2, new_cases)
                     else:
                         new_cases = 0
                 else:
-                    if random.random() < 0.15:
-                        new_cases = random.randint(0, 3)
+                    if gate < 0.15:
+                        new_cases = _scale_int(magnitude, 0, 3)
                     else:
                         continue
 
@@ -441,48 +622,51 @@ def seed_case_scenario(db, lgas, lga_dict, epicenter_lgas, neighbor_lgas, today)
                 expected_deaths = new_cases * cfr
                 # Use Poisson-like distribution for deaths
                 if expected_deaths > 0:
-                    deaths = int(expected_deaths + random.uniform(-0.5, 0.5))
+                    deaths = int(expected_deaths + death_noise[i, j])
                     deaths = max(0, deaths)
                 # Small chance of death even with low cases
-                if deaths == 0 and new_cases > 5 and random.random() < 0.3:
+                if deaths == 0 and new_cases > 5 and death_gates[i, j] < 0.3:
                     deaths = 1
 
             # Confirmed vs suspected
-            confirmed_cases = int(new_cases * random.uniform(0.6, 0.9))
+            confirmed_cases = int(new_cases * confirmed_frac[i, j])
             suspected_cases = new_cases - confirmed_cases
 
-            # Check if record exists
-            existing = db.query(CaseReport).filter(
-                CaseReport.lga_id == lga.id,
-                CaseReport.report_date == current_date
-            ).first()
-
-            if not existing:
-                case_report = CaseReport(
-                    lga_id=lga.id,
-                    report_date=current_date,
-                    new_cases=new_cases,
-                    deaths=deaths,
-                    suspected_cases=suspected_cases,
-                    confirmed_cases=confirmed_cases,
-                    source="demo_scenario"
-                )
-                db.add(case_report)
-
-
-def seed_demo_alerts():
-    """Seed demo alerts for demonstration."""
+            case_rows.append({
+                "lga_id": lga_id,
+                "report_date": current_date,
+                "new_cases": new_cases,
+                "deaths": deaths,
+                "suspected_cases": suspected_cases,
+                "confirmed_cases": confirmed_cases,
+                "source": "demo_scenario"
+            })
+
+    # COPY through a staging table; existing (lga_id, date) rows are skipped
+    copy_rows(db, CaseReport.__table__, case_rows, ["lga_id", "report_date"])
+
+
+def seed_demo_alerts(db: Optional[Session] = None):
+    """Seed demo alerts for demonstration.
+
+    Args:
+        db: Optional session to run in. When given, the caller owns the
+            transaction and nothing is committed here.
+    """
     print("Seeding demo alerts...")
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
 
     try:
-        lgas = db.query(LGA).all()
-        if not lgas:
+        # Map LGA names to IDs for easy access (only the two columns are needed)
+        lga_map = dict(db.execute(select(LGA.name, LGA.id)).tuples().all())
+        if not lga_map:
             print("No LGAs found. Please seed LGAs first.")
             return
 
-        # Map LGA names to IDs for easy access
-        lga_map = {lga.name: lga.id for lga in lgas}
+        # Single reference time for all alert timestamps
+        now = datetime.utcnow()
 
         # Define realistic alerts
         alerts_data = [
@@ -500,7 +684,7 @@ def seed_demo_alerts():
                     "threshold_exceeded": "critical_case_surge",
                     "wards_affected": ["Central Ward", "Ekpo Abasi"]
                 },
-                "created_at": datetime.utcnow() - timedelta(hours=12),
+                "created_at": now - timedelta(hours=12),
                 "is_active": True
             },
             {
@@ -516,7 +700,7 @@ def seed_demo_alerts():
                     "rainfall_7day_mm": 187.3,
                     "satellite_source": "Sentinel-1"
                 },
-                "created_at": datetime.utcnow() - timedelta(days=1),
+                "created_at": now - timedelta(days=1),
                 "is_active": True
             },
             # Warning alerts (3)
@@ -533,7 +717,7 @@ def seed_demo_alerts():
                     "percent_increase": 157,
                     "trend": "increasing"
                 },
-                "created_at": datetime.utcnow() - timedelta(days=2),
+                "created_at": now - timedelta(days=2),
                 "is_active": True
             },
             {
@@ -548,9 +732,9 @@ def seed_demo_alerts():
                     "threshold": 100,
                     "forecast": "continued_rain_expected"
                 },
-                "created_at": datetime.utcnow() - timedelta(days=3),
+                "created_at": now - timedelta(days=3),
                 "is_active": True,
-                "acknowledged_at": datetime.utcnow() - timedelta(days=2, hours=6),
+                "acknowledged_at": now - timedelta(days=2, hours=6),
                 "acknowledged_by": 1
             },
             {
@@ -565,7 +749,7 @@ def seed_demo_alerts():
                     "water_sources_affected": 5,
                     "ndwi_change": 0.12
                 },
-                "created_at": datetime.utcnow() - timedelta(days=4),
+                "created_at": now - timedelta(days=4),
                 "is_active": True
             },
             # Info alerts (2)
@@ -582,9 +766,9 @@ def seed_demo_alerts():
                     "lgas_affected": 12,
                     "cfr": 2.3
                 },
-                "created_at": datetime.utcnow() - timedelta(days=2),
+                "created_at": now - timedelta(days=2),
                 "is_active": True,
-                "acknowledged_at": datetime.utcnow() - timedelta(days=1),
+                "acknowledged_at": now - timedelta(days=1),
                 "acknowledged_by": 1
             },
             {
@@ -600,9 +784,9 @@ def seed_demo_alerts():
                     "risk_level": "green",
                     "cases_14day": 0
                 },
-                "created_at": datetime.utcnow() - timedelta(days=5),
+                "created_at": now - timedelta(days=5),
                 "is_active": False,
-                "resolved_at": datetime.utcnow() - timedelta(days=3)
+                "resolved_at": now - timedelta(days=3)
             },
             # Additional warning alert for variety
             {
@@ -618,35 +802,36 @@ def seed_demo_alerts():
                     "location": "Ugep town center",
                     "analysis_method": "spatial_scan_statistic"
                 },
-                "created_at": datetime.utcnow() - timedelta(days=6),
+                "created_at": now - timedelta(days=6),
                 "is_active": True,
-                "acknowledged_at": datetime.utcnow() - timedelta(days=5, hours=18),
+                "acknowledged_at": now - timedelta(days=5, hours=18),
                 "acknowledged_by": 2
             }
         ]
 
         # Create alerts
-        alerts_created = 0
+        valid_ids = set(lga_map.values())
+        existing_alerts = set(db.execute(
+            select(Alert.lga_id, Alert.type, Alert.title)
+        ).tuples().all())
+
+        alert_rows = []
         for alert_data in alerts_data:
             # Skip if LGA doesn't exist
-            if alert_data["lga_id"] is not None and alert_data["lga_id"] not in [lga.id for lga in lgas]:
+            if alert_data["lga_id"] is not None and alert_data["lga_id"] not in valid_ids:
                 continue
 
             # Check if similar alert already exists
-            existing = db.query(Alert).filter(
-                Alert.lga_id == alert_data["lga_id"],
-                Alert.type == alert_data["type"],
-                Alert.title == alert_data["title"]
-            ).first()
-
-            if not existing:
-                alert = Alert(**alert_data)
-                db.add(alert)
-                alerts_created += 1
+            key = (alert_data["lga_id"], alert_data["type"], alert_data["title"])
+            if key not in existing_alerts:
+                alert_rows.append(alert_data)
                 print(f"  Created alert: {alert_data['title']}")
 
-        db.commit()
-        print(f"Created {alerts_created} demo alerts.")
+        if alert_rows:
+            db.execute(insert(Alert), alert_rows)
+        if owns_session:
+            db.commit()
+        print(f"Created {len(alert_rows)} demo alerts.")
 
         # Print summary
         active_alerts = sum(1 for a in alerts_data if a.get("is_active", True))
@@ -656,10 +841,12 @@ def seed_demo_alerts():
 
     except Exception as e:
         print(f"Error seeding alerts: {e}")
-        db.rollback()
+        if owns_session:
+            db.rollback()
         raise
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
 def seed_mock_cholera_data():
@@ -681,7 +868,8 @@ def calculate_initial_risks():
 
     try:
         calculator = RiskCalculator(db)
-        results = calculator.calculate_all()
+        results = calculator.calculate_all(commit=False)
+        db.commit()
 
         success_count = sum(1 for r in results if "error" not in r)
         print(f"Calculated risk scores for {success_count} LGAs.")
@@ -720,20 +908,34 @@ def main():
     create_tables()
     print()
 
-    # Step 2: Seed LGAs
-    seed_lgas()
-    print()
+    # Steps 2-4 share one session and commit once at the end, with secondary
+    # indexes rebuilt after the load rather than maintained row by row
+    drop_bulk_load_indexes()
+    db = SessionLocal()
+    try:
+        # Step 2: Seed LGAs
+        seed_lgas(db)
+        print()
 
-    # Step 3: Seed demo scenario (includes both environmental and case data)
-    seed_demo_scenario()
-    print()
+        # Step 3: Seed demo scenario (includes both environmental and case data)
+        seed_demo_scenario(db)
+        print()
 
-    # Step 4: Calculate risk scores
-    calculate_initial_risks()
-    print()
+        # Step 4: Seed demo alerts
+        seed_demo_alerts(db)
+        print()
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        restore_bulk_load_indexes()
+        print()
 
-    # Step 5: Seed demo alerts
-    seed_demo_alerts()
+    # Step 5: Calculate risk scores (committed once by calculate_initial_risks)
+    calculate_initial_risks()
     print()
 
     print("=" * 50)
@@ -1,14 +1,71 @@
 """Data importer for Excel/CSV cholera and environmental data."""
+import bisect
 import logging
+from collections import deque
 from datetime import datetime, date
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional
 import pandas as pd
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.bulk_load import copy_rows
 from app.models import LGA, Ward, CaseReport, EnvironmentalData
 
 logger = logging.getLogger(__name__)
 
+# Accepted date string formats, in priority order
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%Y/%m/%d"
+]
+
+# Strings _parse_dates hands to pandas' mixed-format inference when no
+# DATE_FORMATS entry matches: day, numeric or named month, and year split by
+# "-", "/", "." or spaces (e.g. "05-Mar-2021", "5 March 2021")
+FALLBACK_DATE_PATTERN = r"\d{1,2}[-/. ]+(?:\d{1,2}|[A-Za-z]{3,9})[-/. ]+\d{4}"
+
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_CHUNK_SIZE = 1000
+
+# Optional integer count columns on case uploads (missing -> 0)
+CASE_COUNT_COLUMNS = [
+    "deaths", "suspected_cases", "confirmed_cases", "recoveries",
+    "cases_under_5", "cases_5_to_14", "cases_15_plus", "cases_male", "cases_female"
+]
+
+# Case columns overwritten when a report for the same LGA/date already exists
+CASE_UPDATE_COLUMNS = ["new_cases", "deaths", "suspected_cases", "confirmed_cases", "recoveries"]
+
+# Line-list aggregates overwrite only the counts they derive
+LINE_LIST_UPDATE_COLUMNS = ["new_cases", "deaths"]
+
+# Error messages kept per import; older ones are dropped as new ones arrive
+MAX_ERRORS = 20
+
+# Above this many rows, bulk writes go through COPY instead of INSERT
+COPY_THRESHOLD = 1024
+
+# Optional float columns on environmental uploads (missing -> NULL)
+ENV_FLOAT_COLUMNS = ["rainfall_mm", "ndwi", "flood_extent_pct", "lst_day", "lst_night"]
+
+# Text values read as True in boolean upload columns (compared lower-cased)
+TRUTHY_VALUES = {"1", "1.0", "true", "yes", "y", "t"}
+
+# Environmental columns an upload may overwrite on existing rows
+ENV_UPDATE_COLUMNS = ["rainfall_mm", "ndwi", "flood_observed"]
+
+# Header clean-up applied after lower/strip; the line-list table also drops
+# the line breaks and parentheses found in the source spreadsheet headers
+COLUMN_TRANSLATION = str.maketrans({" ": "_"})
+LINE_LIST_COLUMN_TRANSLATION = str.maketrans({"\n": None, " ": "_", "(": None, ")": None, "-": "_"})
+
+# Rust-backed Excel reader (python-calamine); much faster and lighter than openpyxl
+EXCEL_ENGINE = "calamine"
+
 
 class DataImporter:
     """Import and validate data from Excel/CSV files."""
@@ -16,16 +73,30 @@ class DataImporter:
     def __init__(self, db: Session):
         self.db = db
         self._lga_cache: Dict[str, int] = {}
+        self._lookup_cache: Dict[str, Optional[int]] = {}
         self._build_lga_cache()
 
     def _build_lga_cache(self):
         """Build cache of LGA name to ID mapping."""
+        # Memoized lookups refer to the previous mapping
+        self._lookup_cache.clear()
         lgas = self.db.query(LGA).all()
         for lga in lgas:
             # Store both exact and lowercase for matching
             self._lga_cache[lga.name.lower()] = lga.id
             self._lga_cache[lga.name.lower().replace(" ", "")] = lga.id
 
+        # Partial-match index: every cached name joined into one string,
+        # searched with str.find; offsets map a hit back to its name
+        self._names = list(self._lga_cache)
+        self._name_ids = list(self._lga_cache.values())
+        self._name_offsets = []
+        offset = 0
+        for name in self._names:
+            self._name_offsets.append(offset)
+            offset += len(name) + 1
+        self._name_blob = "\n".join(self._names)
+
     def _find_lga_id(self, lga_name: str) -> Optional[int]:
         """Find LGA ID from name with fuzzy matching."""
         if not lga_name:
@@ -42,12 +113,154 @@ class DataImporter:
         if name_no_spaces in self._lga_cache:
             return self._lga_cache[name_no_spaces]
 
-        # Try partial match
-        for cached_name, lga_id in self._lga_cache.items():
-            if name_lower in cached_name or cached_name in name_lower:
-                return lga_id
+        # Partial matches are the costly path; remember the outcome
+        if name_lower in self._lookup_cache:
+            return self._lookup_cache[name_lower]
+
+        # First cached name (in cache order) that contains the name or is
+        # contained in it. The blob search finds the first containing name;
+        # only names before it need the reverse containment check.
+        first = len(self._names)
+        if "\n" not in name_lower:
+            position = self._name_blob.find(name_lower)
+            if position >= 0:
+                first = bisect.bisect_right(self._name_offsets, position) - 1
+
+        result = self._name_ids[first] if first < len(self._names) else None
+        for index in range(first):
+            if self._names[index] in name_lower:
+                result = self._name_ids[index]
+                break
 
-        return None
+        self._lookup_cache[name_lower] = result
+        return result
+
+    def _map_lga_ids(self, names: pd.Series) -> pd.Series:
+        """Resolve a column of LGA names to IDs (NaN where unknown).
+
+        Exact and no-space matches are vectorized dict lookups; the partial
+        match fallback in _find_lga_id only runs once per distinct miss.
+        Missing names never match.
+        """
+        normalized = names.astype(str).str.lower().str.strip().where(names.notna())
+        lga_ids = normalized.map(self._lga_cache)
+        lga_ids = lga_ids.fillna(normalized.str.replace(" ", "", regex=False).map(self._lga_cache))
+
+        misses = normalized[lga_ids.isna() & normalized.notna()].unique()
+        if len(misses):
+            fallback = {name: self._find_lga_id(name) for name in misses}
+            lga_ids = lga_ids.fillna(normalized.map(fallback))
+
+        return lga_ids
+
+    def _parse_dates(self, values: pd.Series) -> pd.Series:
+        """Parse a column of dates (None where unparseable).
+
+        Vectorized counterpart of _parse_date: accepts native date/datetime
+        values and strings in the same formats, tried in the same order,
+        then falls back to mixed-format (day-first) inference for strings
+        shaped like FALLBACK_DATE_PATTERN. _parse_date remains for callers
+        handling a single value.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            parsed = values
+        else:
+            is_native = values.map(lambda v: isinstance(v, (datetime, date)))
+            parsed = pd.to_datetime(values.where(is_native), errors="coerce")
+
+            is_text = values.map(lambda v: isinstance(v, str))
+            if is_text.any():
+                text = values.where(is_text).astype(object).str.strip()
+                for fmt in DATE_FORMATS:
+                    if not parsed.isna().any():
+                        break
+                    parsed = parsed.fillna(pd.to_datetime(text, format=fmt, errors="coerce"))
+
+                # Anything left that is still a full day-month-year date
+                # (e.g. "05-Mar-2021") gets pandas' per-element inference;
+                # bare numbers or partial dates stay invalid
+                leftover = parsed.isna() & text.str.fullmatch(FALLBACK_DATE_PATTERN, na=False)
+                if leftover.any():
+                    parsed = parsed.fillna(pd.to_datetime(
+                        text.where(leftover), format="mixed", dayfirst=True, errors="coerce"
+                    ))
+
+        return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+    def _normalize_columns(self, df: pd.DataFrame, translation: Dict[int, Any]) -> None:
+        """Lower-case, strip and translate the DataFrame's column names in place."""
+        df.columns = pd.Index(df.columns).astype(str).str.lower().str.strip().str.translate(translation)
+
+    def _is_line_list_column(self, column: Any) -> bool:
+        """Whether a raw line-list header is one import_line_list_data uses."""
+        name = str(column).lower().strip().translate(LINE_LIST_COLUMN_TRANSLATION)
+        return name in ("lga", "outcome") or ("date" in name and "onset" in name)
+
+    def _int_column(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Integer column with missing or invalid values as 0 (fractions truncated)."""
+        if col not in df.columns:
+            return pd.Series(0, index=df.index, dtype="int64")
+        return pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+
+    def _float_column(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Float column with missing or invalid values as NaN."""
+        if col not in df.columns:
+            return pd.Series(float("nan"), index=df.index)
+        return pd.to_numeric(df[col], errors="coerce")
+
+    def _bool_column(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Boolean column from bool, 0/1 or yes/no style values (missing -> False)."""
+        if col not in df.columns:
+            return pd.Series(False, index=df.index)
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values):
+            return values
+        if pd.api.types.is_numeric_dtype(values):
+            return values.fillna(0) != 0
+        return values.astype(str).str.strip().str.lower().isin(TRUTHY_VALUES)
+
+    def _upsert(
+        self,
+        model,
+        records: pd.DataFrame,
+        conflict_columns: List[str],
+        update_columns: List[str],
+        errors: Deque[str]
+    ) -> int:
+        """Write cleaned records with INSERT ... ON CONFLICT in chunks.
+
+        Conflicting rows get update_columns overwritten (or are left alone
+        when update_columns is empty). Each chunk runs in a savepoint so a
+        failing chunk is reported without discarding the others.
+
+        Returns:
+            Number of records that could not be written.
+        """
+        # A single statement cannot touch the same key twice; last row wins
+        records = records.drop_duplicates(conflict_columns, keep="last")
+        rows = records.astype(object).where(records.notna(), None).to_dict("records")
+
+        # Executed in executemany form: the statement is compiled once and the
+        # engine's insertmanyvalues/values_plus_batch mode batches the rows
+        stmt = pg_insert(model)
+        if update_columns:
+            set_ = {col: stmt.excluded[col] for col in update_columns}
+            set_["updated_at"] = datetime.utcnow()
+            stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+        failed = 0
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(stmt, chunk)
+            except SQLAlchemyError as e:
+                errors.append(f"Batch starting at record {start + 1}: {str(e)}")
+                failed += len(chunk)
+
+        return failed
 
     def _parse_date(self, value: Any) -> Optional[date]:
         """Parse various date formats."""
@@ -59,14 +272,7 @@ class DataImporter:
 
         if isinstance(value, str):
             # Try common formats
-            formats = [
-                "%Y-%m-%d",
-                "%d/%m/%Y",
-                "%m/%d/%Y",
-                "%d-%m-%Y",
-                "%Y/%m/%d"
-            ]
-            for fmt in formats:
+            for fmt in DATE_FORMATS:
                 try:
                     return datetime.strptime(value.strip(), fmt).date()
                 except ValueError:
@@ -74,28 +280,11 @@ class DataImporter:
 
         return None
 
-    def _safe_int(self, value: Any, default: int = 0) -> int:
-        """Safely convert value to integer."""
-        if value is None or pd.isna(value):
-            return default
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_float(self, value: Any, default: float = None) -> Optional[float]:
-        """Safely convert value to float."""
-        if value is None or pd.isna(value):
-            return default
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
     def import_case_data(
         self,
         df: pd.DataFrame,
-        source_file: str = None
+        source_file: str = None,
+        commit: bool = True
     ) -> Dict[str, Any]:
         """
         Import cholera case data from DataFrame.
@@ -108,13 +297,15 @@ class DataImporter:
         - suspected_cases (optional)
         - confirmed_cases (optional)
         - ward_name or ward (optional)
+
+        Pass commit=False to leave the transaction open for the caller.
         """
         records_imported = 0
         records_failed = 0
-        errors = []
+        errors: Deque[str] = deque(maxlen=MAX_ERRORS)
 
         # Normalize column names
-        df.columns = [col.lower().strip().replace(" ", "_") for col in df.columns]
+        self._normalize_columns(df, COLUMN_TRANSLATION)
 
         # Find LGA column
         lga_col = None
@@ -125,7 +316,7 @@ class DataImporter:
 
         if not lga_col:
             errors.append("No LGA column found (expected: lga_name, lga, or local_government)")
-            return {"records_imported": 0, "records_failed": len(df), "errors": errors}
+            return {"records_imported": 0, "records_failed": len(df), "errors": list(errors)}
 
         # Find date column
         date_col = None
@@ -136,7 +327,7 @@ class DataImporter:
 
         if not date_col:
             errors.append("No date column found (expected: report_date, date, or week_ending)")
-            return {"records_imported": 0, "records_failed": len(df), "errors": errors}
+            return {"records_imported": 0, "records_failed": len(df), "errors": list(errors)}
 
         # Find cases column
         cases_col = None
@@ -147,79 +338,51 @@ class DataImporter:
 
         if not cases_col:
             errors.append("No cases column found (expected: new_cases, cases, or total_cases)")
-            return {"records_imported": 0, "records_failed": len(df), "errors": errors}
-
-        # Process rows
-        for idx, row in df.iterrows():
-            try:
-                lga_name = row[lga_col]
-                lga_id = self._find_lga_id(lga_name)
-
-                if not lga_id:
-                    errors.append(f"Row {idx + 2}: Unknown LGA '{lga_name}'")
-                    records_failed += 1
-                    continue
-
-                report_date = self._parse_date(row[date_col])
-                if not report_date:
-                    errors.append(f"Row {idx + 2}: Invalid date '{row[date_col]}'")
-                    records_failed += 1
-                    continue
-
-                new_cases = self._safe_int(row[cases_col])
-
-                # Check for existing record
-                existing = self.db.query(CaseReport).filter(
-                    CaseReport.lga_id == lga_id,
-                    CaseReport.report_date == report_date
-                ).first()
-
-                if existing:
-                    # Update existing
-                    existing.new_cases = new_cases
-                    existing.deaths = self._safe_int(row.get("deaths", 0))
-                    existing.suspected_cases = self._safe_int(row.get("suspected_cases", 0))
-                    existing.confirmed_cases = self._safe_int(row.get("confirmed_cases", 0))
-                    existing.recoveries = self._safe_int(row.get("recoveries", 0))
-                else:
-                    # Create new record
-                    case_report = CaseReport(
-                        lga_id=lga_id,
-                        report_date=report_date,
-                        new_cases=new_cases,
-                        deaths=self._safe_int(row.get("deaths", 0)),
-                        suspected_cases=self._safe_int(row.get("suspected_cases", 0)),
-                        confirmed_cases=self._safe_int(row.get("confirmed_cases", 0)),
-                        recoveries=self._safe_int(row.get("recoveries", 0)),
-                        cases_under_5=self._safe_int(row.get("cases_under_5", 0)),
-                        cases_5_to_14=self._safe_int(row.get("cases_5_to_14", 0)),
-                        cases_15_plus=self._safe_int(row.get("cases_15_plus", 0)),
-                        cases_male=self._safe_int(row.get("cases_male", 0)),
-                        cases_female=self._safe_int(row.get("cases_female", 0)),
-                        source="uploaded",
-                        source_file=source_file
-                    )
-                    self.db.add(case_report)
-
-                records_imported += 1
-
-            except Exception as e:
-                errors.append(f"Row {idx + 2}: {str(e)}")
-                records_failed += 1
-                continue
-
-        self.db.commit()
+            return {"records_imported": 0, "records_failed": len(df), "errors": list(errors)}
+
+        # Resolve LGA ids, dates and counts column-wise
+        lga_ids = self._map_lga_ids(df[lga_col])
+        report_dates = self._parse_dates(df[date_col])
+
+        unknown_lga = lga_ids.isna()
+        invalid_date = ~unknown_lga & report_dates.isna()
+        for idx in df.index[unknown_lga][:MAX_ERRORS]:
+            errors.append(f"Row {idx + 2}: Unknown LGA '{df.at[idx, lga_col]}'")
+        for idx in df.index[invalid_date][:MAX_ERRORS]:
+            errors.append(f"Row {idx + 2}: Invalid date '{df.at[idx, date_col]}'")
+        records_failed += int(unknown_lga.sum() + invalid_date.sum())
+
+        valid = ~(unknown_lga | invalid_date)
+        records = pd.DataFrame({
+            "lga_id": lga_ids[valid].astype("int64"),
+            "report_date": report_dates[valid],
+            "new_cases": self._int_column(df, cases_col)[valid],
+            **{col: self._int_column(df, col)[valid] for col in CASE_COUNT_COLUMNS}
+        })
+
+        records["source"] = "uploaded"
+        records["source_file"] = source_file
+
+        failed = self._upsert(
+            CaseReport, records, ["lga_id", "report_date"], CASE_UPDATE_COLUMNS, errors
+        )
+        records_imported += len(records) - failed
+        records_failed += failed
+
+        if commit:
+            self.db.commit()
 
         return {
             "records_imported": records_imported,
             "records_failed": records_failed,
-            "errors": errors[:20]  # Limit errors returned
+            "errors": list(errors)
         }
 
     def import_environmental_data(
         self,
         df: pd.DataFrame,
-        source_file: str = None
+        source_file: str = None,
+        commit: bool = True
     ) -> Dict[str, Any]:
         """
         Import environmental data from DataFrame.
@@ -230,13 +393,15 @@ class DataImporter:
         - rainfall_mm (optional)
         - ndwi (optional)
         - flood_observed (optional)
+
+        Pass commit=False to leave the transaction open for the caller.
         """
         records_imported = 0
         records_failed = 0
-        errors = []
+        errors: Deque[str] = deque(maxlen=MAX_ERRORS)
 
         # Normalize column names
-        df.columns = [col.lower().strip().replace(" ", "_") for col in df.columns]
+        self._normalize_columns(df, COLUMN_TRANSLATION)
 
         # Find LGA column
         lga_col = None
@@ -247,7 +412,7 @@ class DataImporter:
 
         if not lga_col:
             errors.append("No LGA column found")
-            return {"records_imported": 0, "records_failed": len(df), "errors": errors}
+            return {"records_imported": 0, "records_failed": len(df), "errors": list(errors)}
 
         # Find date column
         date_col = None
@@ -258,84 +423,65 @@ class DataImporter:
 
         if not date_col:
             errors.append("No date column found")
-            return {"records_imported": 0, "records_failed": len(df), "errors": errors}
-
-        # Process rows
-        for idx, row in df.iterrows():
-            try:
-                lga_name = row[lga_col]
-                lga_id = self._find_lga_id(lga_name)
-
-                if not lga_id:
-                    errors.append(f"Row {idx + 2}: Unknown LGA '{lga_name}'")
-                    records_failed += 1
-                    continue
-
-                obs_date = self._parse_date(row[date_col])
-                if not obs_date:
-                    errors.append(f"Row {idx + 2}: Invalid date")
-                    records_failed += 1
-                    continue
-
-                # Check for existing record
-                existing = self.db.query(EnvironmentalData).filter(
-                    EnvironmentalData.lga_id == lga_id,
-                    EnvironmentalData.observation_date == obs_date
-                ).first()
-
-                if existing:
-                    # Update existing
-                    if "rainfall_mm" in df.columns:
-                        existing.rainfall_mm = self._safe_float(row.get("rainfall_mm"))
-                    if "ndwi" in df.columns:
-                        existing.ndwi = self._safe_float(row.get("ndwi"))
-                    if "flood_observed" in df.columns:
-                        existing.flood_observed = bool(row.get("flood_observed"))
-                else:
-                    # Create new record
-                    env_data = EnvironmentalData(
-                        lga_id=lga_id,
-                        observation_date=obs_date,
-                        rainfall_mm=self._safe_float(row.get("rainfall_mm")),
-                        ndwi=self._safe_float(row.get("ndwi")),
-                        flood_observed=bool(row.get("flood_observed", False)),
-                        flood_extent_pct=self._safe_float(row.get("flood_extent_pct")),
-                        lst_day=self._safe_float(row.get("lst_day")),
-                        lst_night=self._safe_float(row.get("lst_night")),
-                        data_source="uploaded"
-                    )
-                    self.db.add(env_data)
-
-                records_imported += 1
-
-            except Exception as e:
-                errors.append(f"Row {idx + 2}: {str(e)}")
-                records_failed += 1
-                continue
-
-        self.db.commit()
+            return {"records_imported": 0, "records_failed": len(df), "errors": list(errors)}
+
+        # Resolve LGA ids and dates column-wise
+        lga_ids = self._map_lga_ids(df[lga_col])
+        obs_dates = self._parse_dates(df[date_col])
+
+        unknown_lga = lga_ids.isna()
+        invalid_date = ~unknown_lga & obs_dates.isna()
+        for idx in df.index[unknown_lga][:MAX_ERRORS]:
+            errors.append(f"Row {idx + 2}: Unknown LGA '{df.at[idx, lga_col]}'")
+        for idx in df.index[invalid_date][:MAX_ERRORS]:
+            errors.append(f"Row {idx + 2}: Invalid date")
+        records_failed += int(unknown_lga.sum() + invalid_date.sum())
+
+        valid = ~(unknown_lga | invalid_date)
+        columns = set(df.columns)
+        flood_observed = self._bool_column(df, "flood_observed")
+        records = pd.DataFrame({
+            "lga_id": lga_ids[valid].astype("int64"),
+            "observation_date": obs_dates[valid],
+            "flood_observed": flood_observed[valid],
+            **{col: self._float_column(df, col)[valid] for col in ENV_FLOAT_COLUMNS}
+        })
+        records["data_source"] = "uploaded"
+
+        # Existing rows only take the columns present in the upload
+        update_columns = [col for col in ENV_UPDATE_COLUMNS if col in columns]
+        failed = self._upsert(
+            EnvironmentalData, records, ["lga_id", "observation_date"], update_columns, errors
+        )
+        records_imported += len(records) - failed
+        records_failed += failed
+
+        if commit:
+            self.db.commit()
 
         return {
             "records_imported": records_imported,
             "records_failed": records_failed,
-            "errors": errors[:20]
+            "errors": list(errors)
         }
 
     def import_line_list_data(
         self,
         df: pd.DataFrame,
-        source_file: Optional[str] = None
+        source_file: Optional[str] = None,
+        commit: bool = True
     ) -> Dict[str, Any]:
         """
         Import line-list case data (one row per patient).
         Aggregates by LGA and Date.
+        Pass commit=False to leave the transaction open for the caller.
         """
         records_imported = 0
         records_failed = 0
-        errors = []
+        errors: Deque[str] = deque(maxlen=MAX_ERRORS)
 
         # Normalize columns
-        df.columns = [col.lower().strip().replace("\n", "").replace(" ", "_").replace("(", "").replace(")", "").replace("-", "_") for col in df.columns]
+        self._normalize_columns(df, LINE_LIST_COLUMN_TRANSLATION)
         
         # Mapping for the specific Excel file provided
         # 'Date of Onset\n(dd-mmm-yyyy)' -> 'date_of_onset_dd_mmm_yyyy'
@@ -363,77 +509,70 @@ class DataImporter:
 
         # Process: Group by LGA and Date
         # First, parse dates and clean LGAs
-        valid_rows = []
-        
-        for idx, row in df.iterrows():
-            try:
-                lga_name = row.get(lga_col)
-                if pd.isna(lga_name): continue
-                
-                lga_id = self._find_lga_id(str(lga_name))
-                if not lga_id:
-                    continue # Skip unknown LGAs
-                
-                # Parse date
-                date_val = row.get(date_col)
-                report_date = self._parse_date(date_val)
-                if not report_date:
-                    continue
-
-                outcome = str(row.get(outcome_col, "")).lower()
-                is_death = "dead" in outcome or "died" in outcome
-                
-                valid_rows.append({
-                    "lga_id": lga_id,
-                    "report_date": report_date,
-                    "is_death": is_death
-                })
-            except Exception:
-                continue
-
-        if not valid_rows:
+        report_dates = self._parse_dates(df[date_col])
+        if lga_col in df.columns:
+            lga_ids = self._map_lga_ids(df[lga_col])
+        else:
+            lga_ids = pd.Series(float("nan"), index=df.index)
+        if outcome_col in df.columns:
+            outcomes = df[outcome_col].astype(str).str.lower()
+            is_death = outcomes.str.contains("dead|died", regex=True, na=False)
+        else:
+            is_death = pd.Series(False, index=df.index)
+
+        # Skip unknown LGAs and unparseable dates
+        valid = lga_ids.notna() & report_dates.notna()
+        valid_count = int(valid.sum())
+
+        if not valid_count:
              return {"records_imported": 0, "records_failed": len(df), "errors": ["No valid rows extracted"]}
 
         # Aggregate
-        agg_df = pd.DataFrame(valid_rows)
-        summary = agg_df.groupby(['lga_id', 'report_date']).agg(
-            new_cases=('lga_id', 'count'),
-            deaths=('is_death', 'sum')
+        cleaned = pd.DataFrame({
+            "lga_id": lga_ids[valid].astype("int64"),
+            "report_date": report_dates[valid],
+            "is_death": is_death[valid]
+        })
+        summary = cleaned.groupby(["lga_id", "report_date"], sort=False).agg(
+            new_cases=("is_death", "size"),
+            deaths=("is_death", "sum")
         ).reset_index()
 
-        # Insert Aggregated Data
-        for _, row in summary.iterrows():
+        summary["source"] = "line_list_upload"
+        summary["source_file"] = source_file
+
+        # Insert Aggregated Data: COPY through a staging table for large
+        # summaries, batched INSERT ... ON CONFLICT otherwise
+        if len(summary) > COPY_THRESHOLD:
             try:
-                existing = self.db.query(CaseReport).filter(
-                    CaseReport.lga_id == row['lga_id'],
-                    CaseReport.report_date == row['report_date']
-                ).first()
-
-                if existing:
-                    existing.new_cases = int(row['new_cases'])
-                    existing.deaths = int(row['deaths'])
-                else:
-                    report = CaseReport(
-                        lga_id=int(row['lga_id']),
-                        report_date=row['report_date'],
-                        new_cases=int(row['new_cases']),
-                        deaths=int(row['deaths']),
-                        source="line_list_upload",
-                        source_file=source_file
+                with self.db.begin_nested():
+                    copy_rows(
+                        self.db,
+                        CaseReport.__table__,
+                        summary.to_dict("records"),
+                        ["lga_id", "report_date"],
+                        LINE_LIST_UPDATE_COLUMNS + ["updated_at"]
                     )
-                    self.db.add(report)
-                
-                records_imported += 1
+                records_imported += len(summary)
             except Exception as e:
+                # copy_rows drives the raw DBAPI cursor, so driver errors are not wrapped
                 errors.append(str(e))
-                records_failed += 1
-
-        self.db.commit()
+                records_failed += len(summary)
+        else:
+            failed = self._upsert(
+                CaseReport, summary, ["lga_id", "report_date"], LINE_LIST_UPDATE_COLUMNS, errors
+            )
+            records_imported += len(summary) - failed
+            records_failed += failed
+
+        if commit:
+            self.db.commit()
         
         return {
             "records_imported": records_imported,
-            "records_failed": len(df) - len(valid_rows), # Rough estimate
-            "errors": errors[:5]
+            # Rows skipped before aggregation plus aggregated reports not written
+            "records_failed": records_failed + (len(df) - valid_count),
+            "errors": list(errors)[:5]
         }
 
     def import_cholera_excel(self, filepath: str) -> Dict[str, Any]:
@@ -443,42 +582,49 @@ class DataImporter:
         """
         try:
             # Read all sheets
-            xl = pd.ExcelFile(filepath)
+            xl = pd.ExcelFile(filepath, engine=EXCEL_ENGINE)
             total_imported = 0
             total_failed = 0
-            all_errors = []
+            all_errors: Deque[str] = deque(maxlen=MAX_ERRORS)
 
             for sheet_name in xl.sheet_names:
-                df = pd.read_excel(xl, sheet_name=sheet_name)
-
-                if df.empty:
+                # Decide how to import the sheet from its header row alone
+                header = pd.read_excel(xl, sheet_name=sheet_name, nrows=0).columns
+                if header.empty:
                     continue
 
                 # Check if it's a line list (has 'Date of Onset')
-                is_line_list = False
-                for col in df.columns:
-                    if "Date of Onset" in str(col):
-                        is_line_list = True
-                        break
+                is_line_list = any("Date of Onset" in str(col) for col in header)
+
+                # Line lists are wide; only parse the columns the importer reads
+                usecols = self._is_line_list_column if is_line_list else None
+                df = pd.read_excel(xl, sheet_name=sheet_name, usecols=usecols)
+
+                if df.empty:
+                    continue
                 
                 if is_line_list:
-                    result = self.import_line_list_data(df, source_file=filepath)
+                    result = self.import_line_list_data(df, source_file=filepath, commit=False)
                 else:
                     # Try import as aggregated case data
-                    result = self.import_case_data(df, source_file=filepath)
+                    result = self.import_case_data(df, source_file=filepath, commit=False)
                 
                 total_imported += result["records_imported"]
                 total_failed += result["records_failed"]
                 all_errors.extend(result.get("errors", []))
 
+            # One commit for the whole workbook rather than one per sheet
+            self.db.commit()
+
             return {
                 "records_imported": total_imported,
                 "records_failed": total_failed,
-                "errors": all_errors[:20]
+                "errors": list(all_errors)
             }
 
         except Exception as e:
             logger.error(f"Error importing Excel file: {e}")
+            self.db.rollback()
             return {
                 "records_imported": 0,
                 "records_failed": 0,
@@ -0,0 +1,41 @@
+"""Shared upsert for per-source environmental_data rows."""
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models import EnvironmentalData
+
+
+def environmental_upsert(value_columns: Sequence[str]):
+    """
+    Build an INSERT ... ON CONFLICT statement merging rows into environmental_data.
+
+    There is one row per (lga_id, observation_date) shared by all data
+    sources. On conflict only value_columns are overwritten, so columns
+    owned by other sources (e.g. GEE flood data vs NASA GPM rainfall) are
+    kept, and the row's data_source is appended to the existing
+    comma-separated list unless already present.
+
+    Args:
+        value_columns: Columns written by the calling source
+
+    Returns:
+        Insert statement to execute with a list of row mappings
+    """
+    stmt = pg_insert(EnvironmentalData)
+    excluded = stmt.excluded
+    current_source = EnvironmentalData.data_source
+    return stmt.on_conflict_do_update(
+        index_elements=["lga_id", "observation_date"],
+        set_={
+            **{col: excluded[col] for col in value_columns},
+            "data_source": case(
+                (func.coalesce(current_source, "") == "", excluded.data_source),
+                (func.strpos(current_source, excluded.data_source) > 0, current_source),
+                else_=current_source + "," + excluded.data_source
+            ),
+            "updated_at": datetime.utcnow()
+        }
+    )
@@ -1,15 +1,53 @@
 """NASA GPM (Global Precipitation Measurement) data service."""
 import logging
 from datetime import date, timedelta
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout, RequestException
+from urllib3.util.retry import Retry
 
 from app.config import get_settings
+from app.services.environmental_upsert import environmental_upsert
+from app.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# environmental_data columns written from GPM results
+GPM_VALUE_COLUMNS = ["rainfall_mm", "rainfall_7day_mm", "rainfall_30day_mm"]
+
+# LGAs whose precipitation is looked up concurrently by fetch_data_for_lgas
+NASA_FETCH_WORKERS = 8
+
+# OpenWeatherMap current-weather readings keyed by (lat, lon). The endpoint
+# only reports current conditions (refreshed about every 10 minutes), so a
+# daily value plus 7- and 30-day totals for a location need one request,
+# not one per day.
+OWM_CACHE_TTL = 10 * 60
+_owm_readings = TTLCache(OWM_CACHE_TTL, maxsize=512)
+
+
+def _pooled_session() -> requests.Session:
+    """Session with keep-alive connection pooling and retries on gateway errors."""
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by all service instances and threads so TLS connections to
+# OpenWeatherMap are reused. Kept separate from the Earthdata session so
+# NASA credentials are never sent to a third party.
+_owm_session = _pooled_session()
+
 
 class NASAGPMService:
     """Service for fetching precipitation data from NASA GPM."""
@@ -29,24 +67,19 @@ class NASAGPMService:
         )
 
     def is_authenticated(self) -> bool:
-        """Check if we can authenticate with NASA Earthdata."""
-        if not self.is_configured():
-            return False
+        """Check if we can authenticate with NASA Earthdata.
 
-        try:
-            # Try a simple auth check
-            session = self._get_session()
-            # We'll verify on first actual request
-            return True
-        except Exception:
-            return False
+        Credentials are verified on the first actual request, so building
+        the session up front would gain nothing.
+        """
+        return self.is_configured()
 
     def _get_session(self) -> requests.Session:
         """Get authenticated session for NASA Earthdata."""
         if self._session is not None:
             return self._session
 
-        self._session = requests.Session()
+        self._session = _pooled_session()
         self._session.auth = (
             settings.nasa_earthdata_username,
             settings.nasa_earthdata_password
@@ -110,6 +143,11 @@ class NASAGPMService:
         if not settings.openweathermap_api_key:
             return None
 
+        key = (round(lat, 4), round(lon, 4))
+        cached = _owm_readings.get(key)
+        if cached is not None:
+            return cached
+
         try:
             url = "https://api.openweathermap.org/data/2.5/weather"
             params = {
@@ -119,7 +157,7 @@ class NASAGPMService:
                 "units": "metric"
             }
 
-            response = requests.get(
+            response = _owm_session.get(
                 url,
                 params=params,
                 timeout=self._timeout
@@ -129,9 +167,10 @@ class NASAGPMService:
 
             # Get rain in last 1h or 3h if available
             rain = data.get("rain", {})
-            rainfall = rain.get("1h", 0) or rain.get("3h", 0)
+            rainfall = float(rain.get("1h", 0) or rain.get("3h", 0))
 
-            return float(rainfall)
+            _owm_readings.set(key, rainfall)
+            return rainfall
 
         except Timeout:
             logger.error(f"Timeout fetching from OpenWeatherMap for ({lat}, {lon})")
@@ -149,33 +188,65 @@ class NASAGPMService:
         lon: float,
         target_date: date
     ) -> float:
+        """Generate mock precipitation for a single day (see _get_mock_precipitation_series)."""
+        return float(self._get_mock_precipitation_series(target_date, 1)[0])
+
+    def _get_mock_precipitation_series(self, end_date: date, days: int) -> np.ndarray:
         """
         Generate mock precipitation data based on Cross River State patterns.
 
         Cross River has two seasons:
         - Rainy season: April to October (heavy rainfall)
         - Dry season: November to March (minimal rainfall)
-        """
-        import random
 
-        month = target_date.month
+        All days are drawn in one vectorized call.
+
+        Returns:
+            Array of length `days` in mm, newest day first
+        """
+        dates = np.datetime64(end_date, "D") - np.arange(days)
+        months = dates.astype("datetime64[M]").astype(int) % 12 + 1
 
         # Seasonal pattern for Cross River State
-        if month in [4, 5, 6, 7, 8, 9, 10]:
-            # Rainy season - higher precipitation
-            base = random.uniform(5, 25)
-            if month in [6, 7, 8, 9]:
-                # Peak rainy season
-                base = random.uniform(10, 40)
-        else:
-            # Dry season - lower precipitation
-            base = random.uniform(0, 5)
+        rainy = (months >= 4) & (months <= 10)
+        peak = (months >= 6) & (months <= 9)  # Peak rainy season
+        low = np.select([peak, rainy], [10, 5], default=0)
+        high = np.select([peak, rainy], [40, 25], default=5)
+
+        rng = np.random.default_rng()
+        base = rng.uniform(low, high)
 
         # Add some daily variation
-        variation = random.uniform(-2, 5)
-        rainfall = max(0, base + variation)
+        variation = rng.uniform(-2, 5, size=days)
+        rainfall = np.maximum(0, base + variation)
 
-        return round(rainfall, 2)
+        return np.round(rainfall, 2)
+
+    def _get_daily_series(
+        self,
+        lat: float,
+        lon: float,
+        end_date: date,
+        days: int
+    ) -> np.ndarray:
+        """
+        Get daily precipitation for the `days` days ending on end_date.
+
+        Returns:
+            Float array of length `days`, newest day first; NaN where no
+            value was available
+        """
+        if not self.is_configured():
+            logger.warning("NASA credentials not configured, using mock data")
+            return self._get_mock_precipitation_series(end_date, days)
+
+        return np.array(
+            [
+                self.get_daily_precipitation(lat, lon, end_date - timedelta(days=i))
+                for i in range(days)
+            ],
+            dtype=float
+        )
 
     def get_cumulative_precipitation(
         self,
@@ -185,25 +256,43 @@ class NASAGPMService:
         days: int = 7
     ) -> Optional[float]:
         """Get cumulative precipitation over a period."""
-        total = 0.0
-        count = 0
-
-        for i in range(days):
-            target_date = end_date - timedelta(days=i)
-            daily = self.get_daily_precipitation(lat, lon, target_date)
-            if daily is not None:
-                total += daily
-                count += 1
+        daily = self._get_daily_series(lat, lon, end_date, days)
+        count = int(np.count_nonzero(~np.isnan(daily)))
 
         if count == 0:
             return None
 
+        total = float(np.nansum(daily))
+
         # Extrapolate if we don't have all days
         if count < days:
             total = total * (days / count)
 
         return round(total, 2)
 
+    def _fetch_lga(
+        self,
+        lga_id: int,
+        lga_name: str,
+        lat: Optional[float],
+        lon: Optional[float],
+        end_date: date
+    ) -> Dict[str, Any]:
+        """Fetch precipitation for one LGA without saving it."""
+        # Use centroid for precipitation lookup
+        lat = lat or 5.5  # Default to Cross River center
+        lon = lon or 8.5
+
+        return {
+            "lga_id": lga_id,
+            "lga_name": lga_name,
+            "observation_date": end_date.isoformat(),
+            # Daily, 7-day and 30-day cumulative
+            "rainfall_mm": self.get_daily_precipitation(lat, lon, end_date),
+            "rainfall_7day_mm": self.get_cumulative_precipitation(lat, lon, end_date, 7),
+            "rainfall_30day_mm": self.get_cumulative_precipitation(lat, lon, end_date, 30)
+        }
+
     def fetch_data_for_lga(
         self,
         lga_id: int,
@@ -221,70 +310,71 @@ class NASAGPMService:
         Returns:
             Dict with fetched data or None
         """
+        results = self.fetch_data_for_lgas([lga_id], start_date, end_date)
+        return results[0] if results else None
+
+    def fetch_data_for_lgas(
+        self,
+        lga_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch precipitation data for many LGAs and save to database.
+
+        LGA centroids are loaded in one query, lookups run on a small thread
+        pool (they are I/O-bound HTTP calls), and all rows are written with
+        one upsert and one commit.
+
+        Args:
+            lga_ids: IDs of the LGAs
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            List of fetched data dicts for the LGAs that were found
+        """
         from app.database import SessionLocal
-        from app.models import LGA, EnvironmentalData
+        from app.models import LGA
 
         db = SessionLocal()
         try:
-            lga = db.query(LGA).filter(LGA.id == lga_id).first()
-            if not lga:
-                logger.warning(f"LGA {lga_id} not found")
-                return None
-
-            # Use centroid for precipitation lookup
-            lat = lga.centroid_lat or 5.5  # Default to Cross River center
-            lon = lga.centroid_lon or 8.5
-
-            # Get daily precipitation
-            rainfall_mm = self.get_daily_precipitation(lat, lon, end_date)
-
-            # Get 7-day cumulative
-            rainfall_7day = self.get_cumulative_precipitation(lat, lon, end_date, 7)
-
-            # Get 30-day cumulative
-            rainfall_30day = self.get_cumulative_precipitation(lat, lon, end_date, 30)
-
-            # Check if environmental data exists for this date
-            existing = db.query(EnvironmentalData).filter(
-                EnvironmentalData.lga_id == lga_id,
-                EnvironmentalData.observation_date == end_date
-            ).first()
-
-            if existing:
-                # Update existing record
-                existing.rainfall_mm = rainfall_mm
-                existing.rainfall_7day_mm = rainfall_7day
-                existing.rainfall_30day_mm = rainfall_30day
-                if not existing.data_source:
-                    existing.data_source = "NASA_GPM"
-                elif "NASA_GPM" not in existing.data_source:
-                    existing.data_source += ",NASA_GPM"
-            else:
-                # Create new record
-                env_data = EnvironmentalData(
-                    lga_id=lga_id,
-                    observation_date=end_date,
-                    rainfall_mm=rainfall_mm,
-                    rainfall_7day_mm=rainfall_7day,
-                    rainfall_30day_mm=rainfall_30day,
-                    data_source="NASA_GPM"
-                )
-                db.add(env_data)
-
+            lgas = db.query(
+                LGA.id, LGA.name, LGA.centroid_lat, LGA.centroid_lon
+            ).filter(LGA.id.in_(lga_ids)).all()
+
+            found = {lga.id for lga in lgas}
+            for lga_id in lga_ids:
+                if lga_id not in found:
+                    logger.warning(f"LGA {lga_id} not found")
+            if not lgas:
+                return []
+
+            with ThreadPoolExecutor(max_workers=NASA_FETCH_WORKERS) as executor:
+                results = list(executor.map(
+                    lambda lga: self._fetch_lga(
+                        lga.id, lga.name, lga.centroid_lat, lga.centroid_lon, end_date
+                    ),
+                    lgas
+                ))
+
+            rows = [
+                {
+                    "lga_id": result["lga_id"],
+                    "observation_date": end_date,
+                    **{col: result[col] for col in GPM_VALUE_COLUMNS},
+                    "data_source": "NASA_GPM"
+                }
+                for result in results
+            ]
+            db.execute(environmental_upsert(GPM_VALUE_COLUMNS), rows)
             db.commit()
 
-            return {
-                "lga_id": lga_id,
-                "lga_name": lga.name,
-                "observation_date": end_date.isoformat(),
-                "rainfall_mm": rainfall_mm,
-                "rainfall_7day_mm": rainfall_7day,
-                "rainfall_30day_mm": rainfall_30day
-            }
+            return results
 
         except Exception as e:
-            logger.error(f"Error fetching GPM data for LGA {lga_id}: {e}")
+            logger.error(f"Error fetching GPM data for {len(lga_ids)} LGA(s): {e}")
             db.rollback()
-            return None
+            return []
         finally:
             db.close()
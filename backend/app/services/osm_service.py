@@ -1,7 +1,17 @@
 """OpenStreetMap integration for health facilities."""
+import hashlib
 import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import orjson
 import requests
-from typing import List, Dict, Any
+from scipy.spatial import cKDTree
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
 from app.models import HealthFacility, LGA
 
@@ -9,73 +19,179 @@ logger = logging.getLogger(__name__)
 
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 
+# On-disk cache of raw Overpass responses, keyed by query hash
+OSM_CACHE_DIR = Path(".cache/osm")
+OSM_CACHE_TTL = 24 * 3600  # seconds
+
+# Overpass tag selectors for health facilities and the element types queried
+FACILITY_SELECTORS = (
+    ('["amenity"="hospital"]', ("node", "way")),
+    ('["amenity"="clinic"]', ("node", "way")),
+    ('["healthcare"="centre"]', ("node",)),
+)
+
+# Mean Earth radius in km
+EARTH_RADIUS_KM = 6371
+
+# Facilities farther than this from every LGA centroid stay unassigned
+MAX_CENTROID_DISTANCE_KM = 50
+
+
+def _unit_vectors(lon, lat) -> np.ndarray:
+    """
+    Convert coordinates to 3-D unit vectors on the sphere.
+
+    Args:
+        lon, lat: Arrays of shape (n,) in degrees
+
+    Returns:
+        Array of shape (n, 3)
+    """
+    lon, lat = np.radians(lon), np.radians(lat)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def _overpass_query(query: str, force_refresh: bool = False) -> bytes:
+    """
+    Run an Overpass query, reusing a cached response younger than OSM_CACHE_TTL.
+
+    Args:
+        query: Overpass QL query
+        force_refresh: Skip the cache and always query Overpass
+
+    Returns:
+        Raw JSON response body
+    """
+    path = OSM_CACHE_DIR / f"{hashlib.sha256(query.encode()).hexdigest()}.json"
+
+    if not force_refresh:
+        try:
+            if time.time() - path.stat().st_mtime < OSM_CACHE_TTL:
+                logger.info(f"Using cached Overpass response {path.name}")
+                return path.read_bytes()
+        except OSError:
+            pass
+
+    response = requests.post(OVERPASS_URL, data={"data": query}, timeout=30)
+    response.raise_for_status()
+    body = response.content
+
+    # Write to a temp file and rename so readers never see a partial file
+    try:
+        OSM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=OSM_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache Overpass response: {e}")
+
+    return body
+
+
 class OSMService:
     """Fetch data from OpenStreetMap."""
     
     def __init__(self, db: Session):
         self.db = db
 
-    def fetch_health_facilities(self, state_name: str = "Cross River"):
+    def _fetch_elements(self, queries: List[str], force_refresh: bool) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run Overpass queries concurrently and merge their elements.
+
+        A failed query is logged and skipped; elements returned by more than
+        one query are kept once (by OSM type and id).
+
+        Returns:
+            Merged elements, or None if every query failed
+        """
+        def run(query: str) -> List[Dict[str, Any]]:
+            # orjson parses the raw bytes directly, skipping the text decode
+            return orjson.loads(_overpass_query(query, force_refresh)).get("elements", [])
+
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        succeeded = 0
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            futures = [pool.submit(run, query) for query in queries]
+            for future in as_completed(futures):
+                try:
+                    elements = future.result()
+                except Exception as e:
+                    logger.error(f"OSM Fetch Error: {e}")
+                    continue
+                succeeded += 1
+                for el in elements:
+                    merged.setdefault((el.get("type"), el.get("id")), el)
+
+        return list(merged.values()) if succeeded else None
+
+    def fetch_health_facilities(self, state_name: str = "Cross River", force_refresh: bool = False):
         """
         Fetch health facilities (hospitals, clinics) from OSM for a given state.
-        Updates the database.
+        Updates the database. Overpass responses are cached on disk for
+        OSM_CACHE_TTL unless force_refresh is set.
         """
-        # Query: Hospitals/Clinics in Cross River State
-        query = f"""
+        # Query: Hospitals/Clinics in Cross River State, one subquery per
+        # facility kind so they run in parallel and each stays well inside
+        # Overpass's per-query timeout
+        queries = []
+        for selector, element_types in FACILITY_SELECTORS:
+            statements = "".join(f"{element}{selector}(area.searchArea);" for element in element_types)
+            queries.append(f"""
         [out:json][timeout:25];
         area["name"="{state_name}"]->.searchArea;
-        (
-          node["amenity"="hospital"](area.searchArea);
-          way["amenity"="hospital"](area.searchArea);
-          node["amenity"="clinic"](area.searchArea);
-          way["amenity"="clinic"](area.searchArea);
-          node["healthcare"="centre"](area.searchArea);
-        );
+        ({statements});
         out center;
-        """
-        
+        """)
+
+        elements = self._fetch_elements(queries, force_refresh)
+        if elements is None:
+            return 0
+        logger.info(f"Fetched {len(elements)} facilities from OSM")
+
         try:
-            response = requests.post(OVERPASS_URL, data={"data": query}, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            elements = data.get("elements", [])
-            logger.info(f"Fetched {len(elements)} facilities from OSM")
-            
-            count = 0
+            # One query for the known names instead of a lookup per element;
+            # names are added as they are queued so repeats within this OSM
+            # response are skipped too
+            seen = {name for (name,) in self.db.query(HealthFacility.name).all()}
+
+            new_facilities = []
+            append = new_facilities.append
             for el in elements:
-                tags = el.get("tags", {})
+                tags = el.get("tags")
+                if not tags:
+                    continue
                 name = tags.get("name")
-                if not name:
+                if not name or name in seen:
                     continue
-                    
-                lat = el.get("lat") or el.get("center", {}).get("lat")
-                lon = el.get("lon") or el.get("center", {}).get("lon")
-                
+
+                # Ways carry their coordinates in "center" (out center)
+                lat = el.get("lat")
+                lon = el.get("lon")
+                if lat is None or lon is None:
+                    center = el.get("center")
+                    if not center:
+                        continue
+                    lat = center.get("lat")
+                    lon = center.get("lon")
+
                 if not lat or not lon:
                     continue
-                    
-                # Find LGA (Spatial Join - simple bounding box approximation or closest centroid)
-                # For demo, we might need a robust spatial join if PostGIS is enabled.
-                # Assuming lga_id can be mapped later or via spatial query.
-                # Here we will try to find nearest LGA centroid if we don't have full polygon intersection logic readily available in python without shapely/geopandas dependency.
-                # Note: The DB now has PostGIS geometry columns for spatial queries.
-                
-                facility_type = tags.get("amenity") or tags.get("healthcare")
-                
-                # Check existence
-                existing = self.db.query(HealthFacility).filter(HealthFacility.name == name).first()
-                if not existing:
-                    facility = HealthFacility(
-                        name=name,
-                        type=facility_type,
-                        latitude=lat,
-                        longitude=lon,
-                        # lga_id will be assigned by spatial join in a separate step or improved query
-                    )
-                    self.db.add(facility)
-                    count += 1
-            
+
+                # lga_id is assigned afterwards by assign_facilities_to_lgas
+                # (PostGIS point-in-polygon join)
+                append({
+                    "name": name,
+                    "type": tags.get("amenity") or tags.get("healthcare"),
+                    "latitude": lat,
+                    "longitude": lon,
+                })
+                seen.add(name)
+
+            # Plain row dicts through one executemany INSERT, no ORM instances
+            if new_facilities:
+                self.db.execute(insert(HealthFacility), new_facilities)
+            count = len(new_facilities)
             self.db.commit()
             return count
             
@@ -86,40 +202,79 @@ class OSMService:
     def assign_facilities_to_lgas(self):
         """
         Assigns imported facilities to LGAs based on coordinates.
-        This is a simplified distance check for the demo.
+
+        Facilities are first matched to the LGA polygon containing them with
+        a single PostGIS UPDATE ... FROM (ST_Contains, backed by the spatial
+        index on lgas.geometry). Facilities left over (outside every polygon,
+        or LGAs without geometry) fall back to the nearest LGA centroid
+        within 50 km.
         """
-        from math import radians, cos, sin, asin, sqrt
-
-        def haversine(lon1, lat1, lon2, lat2):
-            """Calculate distance between two points in km."""
-            lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371
-            return c * r
-
-        facilities = self.db.query(HealthFacility).filter(HealthFacility.lga_id.is_(None)).all()
-        lgas = self.db.query(LGA).all()
-        
-        updated = 0
-        for fac in facilities:
-            closest_lga = None
-            min_dist = float('inf')
-            
-            for lga in lgas:
-                if lga.centroid_lat and lga.centroid_lon:
-                    dist = haversine(fac.longitude, fac.latitude, lga.centroid_lon, lga.centroid_lat)
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_lga = lga
-            
-            # If reasonably close (e.g. within 50km of centroid), assign
-            # Note: This is a rough approximation. Point-in-Polygon is better but requires shapely.
-            if closest_lga and min_dist <= 50:
-                fac.lga_id = closest_lga.id
-                updated += 1
-        
+        point = func.ST_SetSRID(
+            func.ST_MakePoint(HealthFacility.longitude, HealthFacility.latitude), 4326
+        )
+        contained = self.db.execute(
+            update(HealthFacility)
+            .where(
+                HealthFacility.lga_id.is_(None),
+                HealthFacility.latitude.isnot(None),
+                HealthFacility.longitude.isnot(None),
+                func.ST_Contains(LGA.geometry, point)
+            )
+            .values(lga_id=LGA.id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        updated = contained + self._assign_nearest_centroid()
         self.db.commit()
         return updated
+
+    def _assign_nearest_centroid(self) -> int:
+        """
+        Assign unmatched facilities to the nearest LGA centroid within 50 km.
+
+        LGA centroids are indexed in a KD-tree over unit vectors, so each
+        facility's nearest centroid is a tree query; the chord distance
+        between unit vectors maps directly to great-circle distance.
+        Nothing is committed here.
+        """
+        facilities = self.db.query(
+            HealthFacility.id, HealthFacility.latitude, HealthFacility.longitude
+        ).filter(
+            HealthFacility.lga_id.is_(None),
+            HealthFacility.latitude.isnot(None),
+            HealthFacility.longitude.isnot(None)
+        ).all()
+        lgas = self.db.query(LGA.id, LGA.centroid_lat, LGA.centroid_lon).filter(
+            LGA.centroid_lat.isnot(None),
+            LGA.centroid_lon.isnot(None)
+        ).all()
+        if not facilities or not lgas:
+            return 0
+
+        tree = cKDTree(_unit_vectors(
+            np.array([lga.centroid_lon for lga in lgas], dtype=float),
+            np.array([lga.centroid_lat for lga in lgas], dtype=float)
+        ))
+        # Facilities with no centroid within range get an infinite distance
+        max_chord = 2 * np.sin(MAX_CENTROID_DISTANCE_KM / (2 * EARTH_RADIUS_KM))
+        chord, closest = tree.query(
+            _unit_vectors(
+                np.array([fac.longitude for fac in facilities], dtype=float),
+                np.array([fac.latitude for fac in facilities], dtype=float)
+            ),
+            k=1,
+            distance_upper_bound=max_chord
+        )
+        min_dist = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord, 2.0) / 2)
+
+        # If reasonably close (e.g. within 50km of centroid), assign
+        assignments = [
+            {"id": fac.id, "lga_id": lgas[lga_index].id}
+            for fac, lga_index, dist in zip(facilities, closest, min_dist)
+            if dist <= MAX_CENTROID_DISTANCE_KM
+        ]
+        # Bulk UPDATE by primary key, no ORM instances loaded
+        if assignments:
+            self.db.execute(update(HealthFacility), assignments)
+
+        return len(assignments)
@@ -1,15 +1,38 @@
 """Risk calculation algorithm for cholera outbreak prediction."""
-from datetime import date, timedelta
-from typing import Optional, Dict, Any, List
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+import hashlib
 import logging
+import math
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models import LGA, CaseReport, EnvironmentalData, RiskScore
-from app.models.environmental import RiskLevel
+from app.models.environmental import LEVEL_THRESHOLDS, LEVELS
+from app.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# LGA attributes used for scoring change only on (re)seeding, so single-LGA
+# calculations reuse them instead of reloading the row each time
+LGA_CACHE_TTL = 3600  # seconds
+
+
+class LGAInfo(NamedTuple):
+    """Read-only snapshot of the LGA attributes used for scoring."""
+    id: int
+    name: str
+    water_coverage_pct: float
+    sanitation_coverage_pct: float
+
+
+_lga_info = TTLCache(LGA_CACHE_TTL, maxsize=512)
+
+# Water/sanitation coverage assumed where an LGA has none recorded
+DEFAULT_COVERAGE_PCT = 50.0
+
 
 class RiskCalculator:
     """
@@ -26,6 +49,13 @@ class RiskCalculator:
     W_CASES = 0.3       # Recent cholera cases
     W_VULNERABILITY = 0.1  # Infrastructure vulnerability
 
+    # RiskScore columns written for each score (besides input_hash)
+    SCORE_COLUMNS = (
+        "lga_id", "score_date", "score", "level",
+        "flood_score", "rainfall_score", "case_score", "vulnerability_score",
+        "rainfall_mm", "ndwi", "recent_cases", "recent_deaths"
+    )
+
     # Normalization parameters
     MAX_RAINFALL_MM = 200.0  # Max expected 7-day rainfall
     MAX_RECENT_CASES = 50    # Max cases for normalization
@@ -34,90 +64,100 @@ class RiskCalculator:
     def __init__(self, db: Session):
         self.db = db
 
-    def normalize(self, value: float, min_val: float, max_val: float) -> float:
-        """Normalize value to 0-1 range."""
-        if value is None:
-            return 0.0
+    @staticmethod
+    def normalize(values: np.ndarray, min_val: float, max_val: float) -> np.ndarray:
+        """Normalize values to 0-1 range (missing values stay NaN)."""
         if max_val == min_val:
-            return 0.0
-        normalized = (value - min_val) / (max_val - min_val)
-        return max(0.0, min(1.0, normalized))
+            return np.where(np.isnan(values), np.nan, 0.0)
+        return np.clip((values - min_val) / (max_val - min_val), 0.0, 1.0)
 
     def calculate_flood_score(
         self,
-        ndwi: Optional[float],
-        flood_extent_pct: Optional[float]
-    ) -> float:
-        """Calculate flood risk component."""
-        if ndwi is None and flood_extent_pct is None:
-            return 0.0
-
-        score = 0.0
-
-        # NDWI contribution (higher NDWI = more water)
-        if ndwi is not None:
-            # NDWI ranges from -1 to 1, water typically > 0.3
-            ndwi_normalized = self.normalize(ndwi, -0.5, 0.8)
-            score += ndwi_normalized * 0.6
+        ndwi: np.ndarray,
+        flood_extent_pct: np.ndarray
+    ) -> np.ndarray:
+        """Calculate flood risk component (NaN inputs contribute nothing)."""
+        # NDWI ranges from -1 to 1, water typically > 0.3 (higher NDWI = more water)
+        ndwi_normalized = np.nan_to_num(self.normalize(ndwi, -0.5, 0.8))
 
         # Flood extent contribution
-        if flood_extent_pct is not None:
-            extent_normalized = self.normalize(flood_extent_pct, 0, 30)
-            score += extent_normalized * 0.4
+        extent_normalized = np.nan_to_num(self.normalize(flood_extent_pct, 0, 30))
 
-        return min(1.0, score)
+        return np.minimum(1.0, ndwi_normalized * 0.6 + extent_normalized * 0.4)
 
     def calculate_rainfall_score(
         self,
-        rainfall_7day_mm: Optional[float],
-        rainfall_30day_mm: Optional[float] = None
-    ) -> float:
-        """Calculate rainfall risk component."""
-        if rainfall_7day_mm is None:
-            return 0.0
-
+        rainfall_7day_mm: np.ndarray,
+        rainfall_30day_mm: np.ndarray
+    ) -> np.ndarray:
+        """Calculate rainfall risk component (0 where 7-day rainfall is missing)."""
         # 7-day rainfall is primary indicator
         score = self.normalize(rainfall_7day_mm, 0, self.MAX_RAINFALL_MM)
 
         # 30-day adds context for sustained wet conditions
-        if rainfall_30day_mm is not None:
-            sustained_score = self.normalize(rainfall_30day_mm, 0, 500)
-            score = score * 0.7 + sustained_score * 0.3
+        sustained_score = self.normalize(rainfall_30day_mm, 0, 500)
+        score = np.where(np.isnan(sustained_score), score, score * 0.7 + sustained_score * 0.3)
 
-        return score
+        return np.nan_to_num(score)
 
     def calculate_case_score(
         self,
-        recent_cases: int,
-        recent_deaths: int = 0
-    ) -> float:
+        recent_cases: np.ndarray,
+        recent_deaths: np.ndarray
+    ) -> np.ndarray:
         """Calculate epidemiological risk component."""
         # Base score from case count
         case_score = self.normalize(recent_cases, 0, self.MAX_RECENT_CASES)
 
-        # Death multiplier (deaths indicate severity)
-        if recent_deaths > 0 and recent_cases > 0:
-            cfr = recent_deaths / recent_cases
-            # High CFR increases risk
-            if cfr > 0.05:
-                case_score = min(1.0, case_score * 1.3)
-
-        return case_score
+        # Death multiplier (deaths indicate severity): high CFR increases risk
+        cfr = np.divide(
+            recent_deaths, recent_cases,
+            out=np.zeros_like(case_score), where=recent_cases > 0
+        )
+        return np.where(cfr > 0.05, np.minimum(1.0, case_score * 1.3), case_score)
 
-    def calculate_vulnerability_score(self, lga: LGA) -> float:
+    def calculate_vulnerability_score(
+        self,
+        water_coverage_pct: np.ndarray,
+        sanitation_coverage_pct: np.ndarray
+    ) -> np.ndarray:
         """
         Calculate vulnerability based on infrastructure factors.
         Lower water/sanitation coverage = higher vulnerability.
-        """
-        water = lga.water_coverage_pct or 50
-        sanitation = lga.sanitation_coverage_pct or 50
 
+        Coverage must already have missing values replaced (see
+        get_lgas_info).
+        """
         # Invert: lower coverage = higher vulnerability
-        water_vuln = 1 - (water / 100)
-        sanitation_vuln = 1 - (sanitation / 100)
+        water_vuln = 1 - (water_coverage_pct / 100)
+        sanitation_vuln = 1 - (sanitation_coverage_pct / 100)
 
         return (water_vuln * 0.5 + sanitation_vuln * 0.5)
 
+    def _lga_info_query(self):
+        """Query LGAInfo columns, with missing (or zero) coverage defaulted in SQL."""
+        return self.db.query(
+            LGA.id,
+            LGA.name,
+            func.coalesce(func.nullif(LGA.water_coverage_pct, 0), DEFAULT_COVERAGE_PCT),
+            func.coalesce(func.nullif(LGA.sanitation_coverage_pct, 0), DEFAULT_COVERAGE_PCT)
+        )
+
+    def get_lgas_info(self) -> List[LGAInfo]:
+        """Get the scoring attributes of every LGA in one query."""
+        return [LGAInfo(*row) for row in self._lga_info_query().all()]
+
+    def get_lga_info(self, lga_id: int) -> Optional[LGAInfo]:
+        """Get an LGA's scoring attributes, cached for LGA_CACHE_TTL."""
+        info = _lga_info.get(lga_id)
+        if info is None:
+            row = self._lga_info_query().filter(LGA.id == lga_id).first()
+            if row is None:
+                return None
+            info = LGAInfo(*row)
+            _lga_info.set(lga_id, info)
+        return info
+
     def get_recent_cases(
         self,
         lga_id: int,
@@ -139,6 +179,23 @@ class RiskCalculator:
             "deaths": result[1] or 0
         }
 
+    def get_recent_cases_by_lga(self, days: int = 14) -> Dict[int, Dict[str, int]]:
+        """Get recent case and death counts for every LGA in one grouped query."""
+        start_date = date.today() - timedelta(days=days)
+
+        rows = self.db.query(
+            CaseReport.lga_id,
+            func.sum(CaseReport.new_cases),
+            func.sum(CaseReport.deaths)
+        ).filter(
+            CaseReport.report_date >= start_date
+        ).group_by(CaseReport.lga_id).all()
+
+        return {
+            lga_id: {"cases": cases or 0, "deaths": deaths or 0}
+            for lga_id, cases, deaths in rows
+        }
+
     def get_latest_environmental(self, lga_id: int) -> Optional[EnvironmentalData]:
         """Get most recent environmental data for an LGA."""
         return self.db.query(EnvironmentalData).filter(
@@ -147,20 +204,204 @@ class RiskCalculator:
             EnvironmentalData.observation_date.desc()
         ).first()
 
+    def get_latest_environmental_by_lga(self) -> Dict[int, EnvironmentalData]:
+        """Get the most recent environmental data of every LGA (DISTINCT ON) in one query."""
+        rows = self.db.query(EnvironmentalData).distinct(
+            EnvironmentalData.lga_id
+        ).order_by(
+            EnvironmentalData.lga_id,
+            EnvironmentalData.observation_date.desc()
+        ).all()
+
+        return {row.lga_id: row for row in rows}
+
+    @staticmethod
+    def _input_hash(
+        lga: LGAInfo,
+        env_data: Optional[EnvironmentalData],
+        case_data: Dict[str, int]
+    ) -> str:
+        """
+        Fingerprint the inputs a score is computed from.
+
+        Environmental rows are upserted in place, so their updated_at is
+        hashed along with the id.
+        """
+        inputs = (
+            env_data.id if env_data else None,
+            env_data.updated_at if env_data else None,
+            case_data["cases"],
+            case_data["deaths"],
+            lga.water_coverage_pct,
+            lga.sanitation_coverage_pct
+        )
+        return hashlib.md5(repr(inputs).encode()).hexdigest()
+
+    def _score_lgas(
+        self,
+        inputs: List[Tuple[LGAInfo, Optional[EnvironmentalData], Dict[str, int]]],
+        score_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute risk scores for LGAs from already-loaded inputs.
+
+        Inputs are gathered into one array per factor so each component is
+        scored for every LGA at once.
+
+        Args:
+            inputs: (LGA, latest environmental data, recent cases) per LGA
+            score_date: Date the scores are for
+
+        Returns:
+            Dict with the RiskScore column values for each LGA, in input order
+        """
+        def column(values) -> np.ndarray:
+            return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+        lgas = [lga for lga, _, _ in inputs]
+        envs = [env for _, env, _ in inputs]
+        cases = [case_data for _, _, case_data in inputs]
+
+        ndwi = column(env.ndwi if env else None for env in envs)
+        rainfall_7day = column(env.rainfall_7day_mm if env else None for env in envs)
+        recent_cases = column(c["cases"] for c in cases)
+        recent_deaths = column(c["deaths"] for c in cases)
+
+        # Calculate component scores
+        flood_scores = self.calculate_flood_score(
+            ndwi, column(env.flood_extent_pct if env else None for env in envs)
+        )
+        rainfall_scores = self.calculate_rainfall_score(
+            rainfall_7day, column(env.rainfall_30day_mm if env else None for env in envs)
+        )
+        case_scores = self.calculate_case_score(recent_cases, recent_deaths)
+        vulnerability_scores = self.calculate_vulnerability_score(
+            column(lga.water_coverage_pct for lga in lgas),
+            column(lga.sanitation_coverage_pct for lga in lgas)
+        )
+
+        # Calculate weighted composite score
+        components = np.stack([flood_scores, rainfall_scores, case_scores, vulnerability_scores], axis=1)
+        weights = np.array([self.W_FLOOD, self.W_RAIN, self.W_CASES, self.W_VULNERABILITY])
+        total_scores = components @ weights
+
+        # Determine risk levels
+        level_indexes = np.searchsorted(LEVEL_THRESHOLDS, total_scores, side="right")
+
+        rows = []
+        for i, lga in enumerate(lgas):
+            level = LEVELS[level_indexes[i]]
+            env = envs[i]
+            rows.append({
+                "lga_id": lga.id,
+                "score_date": score_date,
+                "score": float(total_scores[i]),
+                "level": level.value if hasattr(level, 'value') else level,
+                "flood_score": float(flood_scores[i]),
+                "rainfall_score": float(rainfall_scores[i]),
+                "case_score": float(case_scores[i]),
+                "vulnerability_score": float(vulnerability_scores[i]),
+                "rainfall_mm": env.rainfall_7day_mm if env else None,
+                "ndwi": env.ndwi if env else None,
+                "recent_cases": cases[i]["cases"],
+                "recent_deaths": cases[i]["deaths"]
+            })
+        return rows
+
+    def _score_each(
+        self,
+        inputs: List[Tuple[LGAInfo, Optional[EnvironmentalData], Dict[str, int]]],
+        score_date: date
+    ) -> List[Any]:
+        """
+        Score LGAs together, isolating any LGA whose inputs cannot be scored.
+
+        Returns:
+            Per input, the RiskScore column values or the Exception raised
+            (a non-finite score counts as an error)
+        """
+        if not inputs:
+            return []
+        try:
+            scored = self._score_lgas(inputs, score_date)
+        except Exception as e:
+            if len(inputs) == 1:
+                return [e]
+            # Rescore one by one to find the LGA(s) that failed the batch
+            return [self._score_each([entry], score_date)[0] for entry in inputs]
+
+        return [
+            values if math.isfinite(values["score"])
+            else ValueError(f"Non-finite risk score {values['score']}")
+            for values in scored
+        ]
+
+    def _upsert_scores(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or overwrite RiskScore rows on (lga_id, score_date) (not committed)."""
+        if not rows:
+            return
+
+        stmt = pg_insert(RiskScore)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["lga_id", "score_date"],
+            set_={
+                **{col: stmt.excluded[col] for col in rows[0] if col not in ("lga_id", "score_date")},
+                "calculated_at": datetime.utcnow()
+            }
+        )
+        self.db.execute(stmt, rows)
+
+    def _error(self, lga: LGAInfo, error: Exception) -> Dict[str, Any]:
+        """Log a failed LGA and build its error result."""
+        logger.error(f"Error calculating risk for LGA {lga.id}: {error}")
+        return {
+            "lga_id": lga.id,
+            "lga_name": lga.name,
+            "error": str(error)
+        }
+
+    def _stored_values(self, stored: RiskScore) -> Dict[str, Any]:
+        """Read the score column values back from a stored RiskScore."""
+        return {col: getattr(stored, col) for col in self.SCORE_COLUMNS}
+
+    def _result(self, lga: LGAInfo, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the API result for a computed score."""
+        return {
+            "lga_id": lga.id,
+            "lga_name": lga.name,
+            "score_date": values["score_date"].isoformat(),
+            "score": round(values["score"], 4),
+            "level": values["level"],
+            "components": {
+                "flood": round(values["flood_score"], 4),
+                "rainfall": round(values["rainfall_score"], 4),
+                "cases": round(values["case_score"], 4),
+                "vulnerability": round(values["vulnerability_score"], 4)
+            },
+            "raw_values": {
+                "rainfall_7day_mm": values["rainfall_mm"],
+                "ndwi": values["ndwi"],
+                "recent_cases": values["recent_cases"],
+                "recent_deaths": values["recent_deaths"]
+            }
+        }
+
     def calculate_for_lga(
         self,
         lga_id: int,
-        score_date: Optional[date] = None
+        score_date: Optional[date] = None,
+        commit: bool = True
     ) -> Dict[str, Any]:
         """
         Calculate risk score for a single LGA.
 
         Returns dict with score, level, and component breakdowns.
+        Pass commit=False to leave the transaction open for the caller.
         """
         if score_date is None:
             score_date = date.today()
 
-        lga = self.db.query(LGA).filter(LGA.id == lga_id).first()
+        lga = self.get_lga_info(lga_id)
         if not lga:
             return {"error": f"LGA {lga_id} not found"}
 
@@ -168,117 +409,89 @@ class RiskCalculator:
         env_data = self.get_latest_environmental(lga_id)
         case_data = self.get_recent_cases(lga_id)
 
-        # Calculate component scores
-        flood_score = 0.0
-        rainfall_score = 0.0
-        rainfall_mm = None
-        ndwi = None
-
-        if env_data:
-            flood_score = self.calculate_flood_score(
-                env_data.ndwi,
-                env_data.flood_extent_pct
-            )
-            rainfall_score = self.calculate_rainfall_score(
-                env_data.rainfall_7day_mm,
-                env_data.rainfall_30day_mm
-            )
-            rainfall_mm = env_data.rainfall_7day_mm
-            ndwi = env_data.ndwi
-
-        case_score = self.calculate_case_score(
-            case_data["cases"],
-            case_data["deaths"]
-        )
-
-        vulnerability_score = self.calculate_vulnerability_score(lga)
-
-        # Calculate weighted composite score
-        total_score = (
-            flood_score * self.W_FLOOD +
-            rainfall_score * self.W_RAIN +
-            case_score * self.W_CASES +
-            vulnerability_score * self.W_VULNERABILITY
-        )
-
-        # Determine risk level
-        level = RiskScore.get_level_from_score(total_score)
-
-        # Create/update risk score record
-        existing = self.db.query(RiskScore).filter(
+        stored = self.db.query(RiskScore).filter(
             RiskScore.lga_id == lga_id,
             RiskScore.score_date == score_date
         ).first()
 
-        if existing:
-            existing.score = total_score
-            existing.level = level.value if hasattr(level, 'value') else level
-            existing.flood_score = flood_score
-            existing.rainfall_score = rainfall_score
-            existing.case_score = case_score
-            existing.vulnerability_score = vulnerability_score
-            existing.rainfall_mm = rainfall_mm
-            existing.ndwi = ndwi
-            existing.recent_cases = case_data["cases"]
-            existing.recent_deaths = case_data["deaths"]
-            risk_record = existing
-        else:
-            risk_record = RiskScore(
-                lga_id=lga_id,
-                score_date=score_date,
-                score=total_score,
-                level=level.value if hasattr(level, 'value') else level,
-                flood_score=flood_score,
-                rainfall_score=rainfall_score,
-                case_score=case_score,
-                vulnerability_score=vulnerability_score,
-                rainfall_mm=rainfall_mm,
-                ndwi=ndwi,
-                recent_cases=case_data["cases"],
-                recent_deaths=case_data["deaths"]
-            )
-            self.db.add(risk_record)
-
-        self.db.commit()
+        # Reuse the stored score unless its inputs changed
+        input_hash = self._input_hash(lga, env_data, case_data)
+        if stored is not None and stored.input_hash == input_hash:
+            return self._result(lga, self._stored_values(stored))
 
-        return {
-            "lga_id": lga_id,
-            "lga_name": lga.name,
-            "score_date": score_date.isoformat(),
-            "score": round(total_score, 4),
-            "level": level.value if hasattr(level, 'value') else level,
-            "components": {
-                "flood": round(flood_score, 4),
-                "rainfall": round(rainfall_score, 4),
-                "cases": round(case_score, 4),
-                "vulnerability": round(vulnerability_score, 4)
-            },
-            "raw_values": {
-                "rainfall_7day_mm": rainfall_mm,
-                "ndwi": ndwi,
-                "recent_cases": case_data["cases"],
-                "recent_deaths": case_data["deaths"]
-            }
-        }
+        values = self._score_lgas([(lga, env_data, case_data)], score_date)[0]
+        values["input_hash"] = input_hash
+
+        # Create/update risk score record
+        self._upsert_scores([values])
+        if commit:
+            self.db.commit()
+
+        return self._result(lga, values)
 
     def calculate_all(
         self,
-        score_date: Optional[date] = None
+        score_date: Optional[date] = None,
+        commit: bool = True
     ) -> List[Dict[str, Any]]:
-        """Calculate risk scores for all LGAs."""
-        lgas = self.db.query(LGA).all()
-        results = []
+        """
+        Calculate risk scores for all LGAs.
+
+        Inputs for every LGA (latest environmental data, recent cases and
+        stored scores for the date) are loaded with one query each. LGAs
+        whose inputs are unchanged keep their stored score; the rest are
+        upserted in a single statement and committed together.
+        Pass commit=False to leave the transaction open for the caller.
+        """
+        if score_date is None:
+            score_date = date.today()
+
+        lgas = self.get_lgas_info()
+        env_by_lga = self.get_latest_environmental_by_lga()
+        cases_by_lga = self.get_recent_cases_by_lga()
+        stored_by_lga = {
+            score.lga_id: score
+            for score in self.db.query(RiskScore).filter(RiskScore.score_date == score_date)
+        }
+        no_cases = {"cases": 0, "deaths": 0}
+        results: List[Optional[Dict[str, Any]]] = []
+        pending = []
+        pending_at = []
+        hashes = []
 
         for lga in lgas:
             try:
-                result = self.calculate_for_lga(lga.id, score_date)
-                results.append(result)
+                env_data = env_by_lga.get(lga.id)
+                case_data = cases_by_lga.get(lga.id, no_cases)
+                input_hash = self._input_hash(lga, env_data, case_data)
+                stored = stored_by_lga.get(lga.id)
+                if stored is not None and stored.input_hash == input_hash:
+                    results.append(self._result(lga, self._stored_values(stored)))
+                    continue
             except Exception as e:
-                logger.error(f"Error calculating risk for LGA {lga.id}: {e}")
-                results.append({
-                    "lga_id": lga.id,
-                    "lga_name": lga.name,
-                    "error": str(e)
-                })
-
+                results.append(self._error(lga, e))
+                continue
+            pending.append((lga, env_data, case_data))
+            pending_at.append(len(results))
+            hashes.append(input_hash)
+            results.append(None)
+
+        # Score every changed LGA at once; a bad LGA is logged and left out
+        # of the upsert so it cannot roll back the other scores
+        rows = []
+        for (lga, _, _), scored, index, input_hash in zip(
+            pending, self._score_each(pending, score_date), pending_at, hashes
+        ):
+            if isinstance(scored, Exception):
+                results[index] = self._error(lga, scored)
+                continue
+            scored["input_hash"] = input_hash
+            rows.append(scored)
+            results[index] = self._result(lga, scored)
+
+        if rows:
+            self._upsert_scores(rows)
+            if commit:
+                self.db.commit()
+        logger.info(f"Risk scores recalculated for {len(rows)} of {len(lgas)} LGAs")
         return results
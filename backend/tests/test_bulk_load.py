@@ -0,0 +1,78 @@
+"""copy_rows CSV encoding and merge statements."""
+import csv
+import io
+from types import SimpleNamespace
+
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+from app.bulk_load import copy_rows
+
+TABLE = Table(
+    "items", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("code", String, nullable=False),
+    Column("label", String),
+    Column("note", String),
+    Column("source", String, default="uploaded"),
+)
+
+
+class _Cursor:
+    """Records the statements and COPY payload copy_rows sends."""
+
+    def __init__(self):
+        self.statements = []
+        self.copy_sql = None
+        self.copy_data = None
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+    def copy_expert(self, sql, buffer):
+        self.copy_sql = sql
+        self.copy_data = buffer.read()
+
+    def close(self):
+        pass
+
+
+def _copy(rows, **kwargs):
+    cursor = _Cursor()
+    db = SimpleNamespace(connection=lambda: SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor)))
+    copy_rows(db, TABLE, rows, ["code"], **kwargs)
+    return cursor
+
+
+def test_none_is_null_and_empty_string_is_kept():
+    cursor = _copy([
+        {"code": "a", "label": None, "note": ""},
+        {"code": "b", "label": "x,y", "note": "plain"},
+    ])
+
+    assert "NULL '\\N'" in cursor.copy_sql
+    assert cursor.copy_data.splitlines() == [
+        'a,\\N,,uploaded',
+        'b,"x,y",plain,uploaded',
+    ]
+    # Unquoted \N is NULL, an empty field is an empty string
+    fields = list(csv.reader(io.StringIO(cursor.copy_data)))
+    assert fields[0] == ["a", "\\N", "", "uploaded"]
+
+
+def test_python_defaults_fill_omitted_columns():
+    cursor = _copy([{"code": "a", "label": "x", "note": None}])
+
+    assert "(code, label, note, source)" in cursor.copy_sql
+    assert cursor.copy_data.strip().endswith(",uploaded")
+
+
+def test_conflict_handling():
+    skipped = _copy([{"code": "a"}])
+    merged = _copy([{"code": "a", "label": "x"}], update_columns=["label"])
+
+    assert skipped.statements[1].endswith("ON CONFLICT (code) DO NOTHING")
+    assert merged.statements[1].endswith("ON CONFLICT (code) DO UPDATE SET label = EXCLUDED.label")
+
+
+def test_no_rows_is_a_no_op():
+    assert _copy([]).statements == []
@@ -0,0 +1,120 @@
+"""DataImporter column-wise helpers against the original per-row functions."""
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pandas as pd
+import pytest
+
+from app.services.data_importer import DataImporter
+
+LGA_NAMES = [
+    "Calabar Municipal", "Calabar South", "Akamkpa", "Akpabuyo", "Bakassi",
+    "Odukpani", "Biase", "Abi", "Yakurr", "Obubra", "Ikom", "Etung", "Boki",
+    "Ogoja", "Yala", "Bekwarra", "Obudu", "Obanliku"
+]
+
+
+class _LGAQuery:
+    def all(self):
+        return [SimpleNamespace(id=i, name=name) for i, name in enumerate(LGA_NAMES, start=1)]
+
+
+class _Session:
+    """Only what DataImporter reads while building its LGA cache."""
+
+    def query(self, *entities):
+        return _LGAQuery()
+
+
+@pytest.fixture
+def importer():
+    return DataImporter(_Session())
+
+
+# Per-row functions as they were before the column-wise rewrites
+def _find_lga_id(cache, lga_name) -> Optional[int]:
+    if not lga_name:
+        return None
+    name_lower = str(lga_name).lower().strip()
+    if name_lower in cache:
+        return cache[name_lower]
+    name_no_spaces = name_lower.replace(" ", "")
+    if name_no_spaces in cache:
+        return cache[name_no_spaces]
+    for cached_name, lga_id in cache.items():
+        if name_lower in cached_name or cached_name in name_lower:
+            return lga_id
+    return None
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.date() if isinstance(value, datetime) else value
+    if isinstance(value, str):
+        for fmt in ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%Y/%m/%d"]:
+            try:
+                return datetime.strptime(value.strip(), fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+LGA_SAMPLE = [
+    "Calabar Municipal", "calabar south", "CALABARSOUTH", " Ikom ", "Obudu LGA",
+    "calabar", "Calabar Municipal Council", "south", "Yakurr/Abi", "abi",
+    "Akpabuyo-Bakassi", "bu", "Obanliku Obudu", "Unknown", "Lagos", "1",
+    None, float("nan"), ""
+]
+
+
+def test_map_lga_ids_matches_per_row_lookup(importer):
+    expected = [_find_lga_id(importer._lga_cache, name) for name in LGA_SAMPLE]
+
+    result = importer._map_lga_ids(pd.Series(LGA_SAMPLE, dtype=object))
+
+    assert [None if pd.isna(v) else int(v) for v in result] == expected
+
+
+def test_map_lga_ids_prefers_first_cached_name(importer):
+    # Ambiguous partial names resolve to the first matching LGA in cache
+    # order, not to the match found first in the name
+    result = importer._map_lga_ids(pd.Series(["calabar", "Obanliku Obudu"]))
+
+    assert list(result) == [1, 17]
+
+
+DATE_SAMPLE = [
+    "2024-01-15", " 2024-01-15 ", "15/01/2024", "01/15/2024", "03/04/2024",
+    "15-01-2024", "2024/01/15", "2024-02-30", "not a date", "",
+    "5", "12", "5/3", "2024", "2024-01-15 10:30",
+    date(2024, 1, 15), datetime(2024, 1, 15, 10, 30), pd.Timestamp("2024-01-15"),
+    None, float("nan")
+]
+
+
+def test_parse_dates_matches_per_row_parse(importer):
+    expected = [_parse_date(value) for value in DATE_SAMPLE]
+
+    result = importer._parse_dates(pd.Series(DATE_SAMPLE, dtype=object))
+
+    assert list(result) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("05-Mar-2021", date(2021, 3, 5)),
+    ("5 March 2021", date(2021, 3, 5)),
+    ("05.03.2021", date(2021, 3, 5)),
+])
+def test_parse_dates_infers_full_day_first_dates(importer, value, expected):
+    # The only inputs accepted beyond _parse_date's formats
+    assert _parse_date(value) is None
+    assert list(importer._parse_dates(pd.Series([value], dtype=object))) == [expected]
+
+
+def test_parse_dates_datetime_column(importer):
+    values = pd.Series(pd.to_datetime(["2024-01-15", None]))
+
+    assert list(importer._parse_dates(values)) == [date(2024, 1, 15), None]
@@ -0,0 +1,142 @@
+"""RiskCalculator array scoring against the original per-LGA formulas."""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import RiskScore
+from app.services.risk_calculator import LGAInfo, RiskCalculator
+
+SCORE_DATE = date(2024, 1, 15)
+
+
+# Scalar formulas as they were before scoring moved to NumPy arrays
+def _normalize(value, min_val, max_val):
+    if value is None:
+        return 0.0
+    if max_val == min_val:
+        return 0.0
+    return max(0.0, min(1.0, (value - min_val) / (max_val - min_val)))
+
+
+def _flood(ndwi, flood_extent_pct):
+    if ndwi is None and flood_extent_pct is None:
+        return 0.0
+    score = 0.0
+    if ndwi is not None:
+        score += _normalize(ndwi, -0.5, 0.8) * 0.6
+    if flood_extent_pct is not None:
+        score += _normalize(flood_extent_pct, 0, 30) * 0.4
+    return min(1.0, score)
+
+
+def _rainfall(rainfall_7day_mm, rainfall_30day_mm):
+    if rainfall_7day_mm is None:
+        return 0.0
+    score = _normalize(rainfall_7day_mm, 0, 200.0)
+    if rainfall_30day_mm is not None:
+        score = score * 0.7 + _normalize(rainfall_30day_mm, 0, 500) * 0.3
+    return score
+
+
+def _cases(recent_cases, recent_deaths):
+    score = _normalize(recent_cases, 0, 50)
+    if recent_deaths > 0 and recent_cases > 0 and recent_deaths / recent_cases > 0.05:
+        score = min(1.0, score * 1.3)
+    return score
+
+
+def _vulnerability(water, sanitation):
+    water = water or 50
+    sanitation = sanitation or 50
+    return (1 - water / 100) * 0.5 + (1 - sanitation / 100) * 0.5
+
+
+def _env(ndwi=None, flood_extent_pct=None, rainfall_7day_mm=None, rainfall_30day_mm=None):
+    return SimpleNamespace(
+        ndwi=ndwi,
+        flood_extent_pct=flood_extent_pct,
+        rainfall_7day_mm=rainfall_7day_mm,
+        rainfall_30day_mm=rainfall_30day_mm
+    )
+
+
+# (environmental data, cases, deaths, water coverage, sanitation coverage)
+CASES = [
+    (None, 0, 0, None, None),
+    (None, 3, 0, 60.0, 40.0),
+    (_env(ndwi=0.35), 0, 0, 55.0, 45.0),
+    (_env(flood_extent_pct=12.5), 10, 1, 70.0, 30.0),
+    (_env(ndwi=0.9, flood_extent_pct=45.0), 80, 2, 20.0, 10.0),
+    (_env(ndwi=-0.8, flood_extent_pct=0.0), 5, 0, 0.0, 0.0),
+    (_env(rainfall_7day_mm=120.0), 25, 0, 50.0, 50.0),
+    (_env(rainfall_7day_mm=250.0, rainfall_30day_mm=600.0), 50, 10, 35.0, 65.0),
+    (_env(rainfall_30day_mm=300.0), 1, 1, 90.0, 80.0),
+    (_env(0.1, 8.0, 45.0, 180.0), 12, 0, 48.5, 52.5),
+    (_env(0.62, 20.0, 95.0, 410.0), 40, 3, 41.0, 38.0),
+]
+
+
+def _lga(index, water, sanitation):
+    # Coverage arrives defaulted by SQL (COALESCE(NULLIF(col, 0), 50))
+    return LGAInfo(index, f"LGA {index}", water or 50.0, sanitation or 50.0)
+
+
+def _inputs():
+    return [
+        (_lga(i, water, sanitation), env, {"cases": cases, "deaths": deaths})
+        for i, (env, cases, deaths, water, sanitation) in enumerate(CASES, start=1)
+    ]
+
+
+@pytest.fixture
+def calculator():
+    # Scoring never touches the session
+    return RiskCalculator(db=None)
+
+
+def test_score_lgas_matches_scalar_formulas(calculator):
+    rows = calculator._score_lgas(_inputs(), SCORE_DATE)
+
+    assert len(rows) == len(CASES)
+    for row, (env, cases, deaths, water, sanitation) in zip(rows, CASES):
+        env = env or _env()
+        flood = _flood(env.ndwi, env.flood_extent_pct)
+        rainfall = _rainfall(env.rainfall_7day_mm, env.rainfall_30day_mm)
+        case = _cases(cases, deaths)
+        vulnerability = _vulnerability(water, sanitation)
+        total = flood * 0.4 + rainfall * 0.2 + case * 0.3 + vulnerability * 0.1
+
+        assert row["flood_score"] == pytest.approx(flood, abs=1e-12)
+        assert row["rainfall_score"] == pytest.approx(rainfall, abs=1e-12)
+        assert row["case_score"] == pytest.approx(case, abs=1e-12)
+        assert row["vulnerability_score"] == pytest.approx(vulnerability, abs=1e-12)
+        assert row["score"] == pytest.approx(total, abs=1e-12)
+        assert round(row["score"], 4) == round(total, 4)
+        assert row["level"] == RiskScore.get_level_from_score(total).value
+        assert row["recent_cases"] == cases
+        assert row["recent_deaths"] == deaths
+        assert row["score_date"] == SCORE_DATE
+
+
+@pytest.mark.parametrize("score, level", [
+    (0.0, "green"),
+    (0.2999, "green"),
+    (0.3, "yellow"),
+    (0.5999, "yellow"),
+    (0.6, "red"),
+    (1.0, "red"),
+])
+def test_level_thresholds(score, level):
+    assert RiskScore.get_level_from_score(score).value == level
+
+
+def test_score_each_isolates_bad_lga(calculator):
+    inputs = _inputs()[:3]
+    inputs.insert(1, (LGAInfo(99, "Bad", 50.0, 50.0), _env(ndwi="not a number"), {"cases": 0, "deaths": 0}))
+
+    scored = calculator._score_each(inputs, SCORE_DATE)
+
+    assert isinstance(scored[1], Exception)
+    assert [row["lga_id"] for i, row in enumerate(scored) if i != 1] == [1, 2, 3]
+    assert scored[0]["score"] == calculator._score_lgas(inputs[:1], SCORE_DATE)[0]["score"]